@@ -0,0 +1,112 @@
+# Ghi asset (ảnh) bất đồng bộ cho dump, kèm thumbnail preview cache theo content hash
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow chỉ cần khi tạo thumbnail
+    Image = None
+
+THUMBNAIL_SUBDIR = "thumb"
+
+
+class AssetWriter:
+    def __init__(self, asset_dir, max_workers=4, thumbnail_size=None):
+        if thumbnail_size is not None and Image is None:
+            raise ValueError("Cần cài Pillow để tạo thumbnail cho asset")
+        self.asset_dir = asset_dir
+        self.thumbnail_size = thumbnail_size
+        self.thumbnail_dir = os.path.join(asset_dir, THUMBNAIL_SUBDIR)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dleng-asset")
+        self._futures = []
+        self._thumbnails = {}
+        self.failed_thumbnails = set()
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        os.makedirs(asset_dir, exist_ok=True)
+        if thumbnail_size is not None:
+            os.makedirs(self.thumbnail_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._executor.shutdown(wait=True)
+
+    def write(self, export_name, blob):
+        """Schedule `blob` to be written as asset/<export_name>. Returns the path relative to output_dir."""
+        export_path = os.path.join(self.asset_dir, export_name)
+        self._futures.append(self._executor.submit(_write_file, export_path, blob))
+        self.bytes_written += len(blob)
+        return os.path.join("asset", export_name)
+
+    def thumbnail(self, blob):
+        """Schedule a downscaled preview of `blob`. Returns its path relative to output_dir, or None."""
+        if self.thumbnail_size is None:
+            return None
+        content_hash = hashlib.sha1(blob).hexdigest()
+        with self._lock:
+            thumb_name = self._thumbnails.get(content_hash)
+            if thumb_name is not None:
+                return os.path.join("asset", THUMBNAIL_SUBDIR, thumb_name)
+            width, height = self.thumbnail_size
+            thumb_name = f"{content_hash}_{width}x{height}.png"
+            self._thumbnails[content_hash] = thumb_name
+        thumb_path = os.path.join(self.thumbnail_dir, thumb_name)
+        if not os.path.isfile(thumb_path):
+            self._futures.append(self._executor.submit(self._write_thumbnail, thumb_name, blob))
+        return os.path.join("asset", THUMBNAIL_SUBDIR, thumb_name)
+
+    def _write_thumbnail(self, thumb_name, blob):
+        png = _render_thumbnail(blob, self.thumbnail_size)
+        if png is None:
+            # Preview là tuỳ chọn: ảnh không decode được chỉ mất thumbnail, dump vẫn tiếp tục
+            with self._lock:
+                self.failed_thumbnails.add(os.path.join("asset", THUMBNAIL_SUBDIR, thumb_name))
+            return
+        _write_file(os.path.join(self.thumbnail_dir, thumb_name), png)
+
+    def flush(self):
+        """Wait for all pending writes; re-raise the first failure."""
+        futures, self._futures = self._futures, []
+        error = None
+        for future in futures:
+            exc = future.exception()
+            if exc is not None and error is None:
+                error = exc
+        if error is not None:
+            raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+
+def _write_file(path, blob):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def _render_thumbnail(blob, size):
+    """PNG bytes of a downscaled `blob`, or None when Pillow cannot decode it (e.g. WMF/EMF off Windows)."""
+    try:
+        with Image.open(io.BytesIO(blob)) as img:
+            img.thumbnail(size)
+            if img.mode not in ("RGB", "RGBA", "L", "LA"):
+                img = img.convert("RGBA")
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG", optimize=True)
+    except Exception:
+        return None
+    return buffer.getvalue()
@@ -2,6 +2,8 @@
 
 import json
 import os
+import time
+from functools import lru_cache
 from pptx import Presentation
 from pptx.slide import Slide
 from pptx.shapes.picture import Picture
@@ -17,6 +19,8 @@ from pptx.text.text import _Paragraph
 from pptx.text.text import TextFrame
 from data.pptxdata import *
 from dacite import from_dict
+from validate import ensure_valid_pptx_data
+import metrics
 
 EMU = 1  # đơn vị đã là EMU trong JSON dump
 
@@ -89,6 +93,7 @@ def apply_cell_border(cell: _Cell, border_info: DL_CellBorder):
     return tcPr
 
 
+@lru_cache(maxsize=1024)
 def parse_color(color_str: Optional[str]) -> dict:
     if color_str is None or color_str == "None":
         return {"type": "none"}
@@ -351,8 +356,21 @@ def rebuild_image(shape_data: Picture, slide: Slide, json_path: str):
 
 
 def build_pptx_from_json(json_path: str, output_path: str):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    started = time.perf_counter()
+    data = {}
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _build_pptx_from_data(data, json_path, output_path)
+    except Exception as e:
+        metrics.record_failure("build", e, time.perf_counter() - started)
+        raise
+    metrics.record_success("build", data, time.perf_counter() - started)
+    print(f"✅ PPTX đã được tạo tại: {output_path}")
+
+
+def _build_pptx_from_data(data: dict, json_path: str, output_path: str):
+    ensure_valid_pptx_data(data)
     pptx_data = from_dict(data_class=DL_PPTXData, data=data)
     prs = Presentation()
     blank_layout = prs.slide_layouts[6]
@@ -374,7 +392,6 @@ def build_pptx_from_json(json_path: str, output_path: str):
                 apply_border(shape, shape_data.border)
 
     prs.save(output_path)
-    print(f"✅ PPTX đã được tạo tại: {output_path}")
 
 
 if __name__ == "__main__":
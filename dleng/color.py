@@ -0,0 +1,122 @@
+# Resolve màu theme (a:schemeClr + lumMod/lumOff/tint/shade) sang RGB qua bảng màu cache theo master
+import colorsys
+import hashlib
+import weakref
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from opc import parse_xml
+
+SCHEME_SLOTS = ("dk1", "lt1", "dk2", "lt2", "accent1", "accent2", "accent3", "accent4",
+                "accent5", "accent6", "hlink", "folHlink")
+# p:clrMap mặc định khi master không khai báo
+DEFAULT_CLR_MAP = {
+    "bg1": "lt1", "tx1": "dk1", "bg2": "lt2", "tx2": "dk2",
+    "accent1": "accent1", "accent2": "accent2", "accent3": "accent3",
+    "accent4": "accent4", "accent5": "accent5", "accent6": "accent6",
+    "hlink": "hlink", "folHlink": "folHlink"
+}
+TRANSFORM_TAGS = {qn(f"a:{name}"): name for name in ("lumMod", "lumOff", "tint", "shade")}
+
+_SCHEMES = weakref.WeakKeyDictionary()
+
+
+def _slot_rgb(slot_elm):
+    for child in slot_elm:
+        if child.tag == qn("a:srgbClr"):
+            return child.get("val").upper()
+        if child.tag == qn("a:sysClr"):
+            last_clr = child.get("lastClr")
+            return last_clr.upper() if last_clr else None
+    return None
+
+
+def apply_transforms(hex_rgb, transforms):
+    """Apply (name, value) color transforms, values in 1/100000 as in DrawingML."""
+    r, g, b = (int(hex_rgb[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    for name, value in transforms:
+        value = value / 100000
+        if name == "tint":
+            r, g, b = (c * value + (1 - value) for c in (r, g, b))
+        elif name == "shade":
+            r, g, b = (c * value for c in (r, g, b))
+        else:
+            h, l, s = colorsys.rgb_to_hls(r, g, b)
+            l = l * value if name == "lumMod" else l + value
+            r, g, b = colorsys.hls_to_rgb(h, min(max(l, 0.0), 1.0), s)
+    return "".join(f"{round(min(max(c, 0.0), 1.0) * 255):02X}" for c in (r, g, b))
+
+
+class ColorScheme:
+    """Theme color table of one slide master (plus an optional clrMap override), parsed once."""
+
+    def __init__(self, slots, clr_map):
+        self.slots = slots
+        self.clr_map = clr_map
+        self.key = hashlib.blake2b(
+            repr((sorted(slots.items()), sorted(clr_map.items()))).encode(), digest_size=8).hexdigest()
+        self._resolved = {}
+        self._overrides = {}
+
+    @classmethod
+    def from_master_part(cls, master_part):
+        scheme = _SCHEMES.get(master_part)
+        if scheme is None:
+            theme = parse_xml(master_part.part_related_by(RT.THEME).blob)
+            clr_scheme = theme.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}")
+            slots = {}
+            if clr_scheme is not None:
+                for slot_elm in clr_scheme:
+                    slots[slot_elm.tag.split("}")[1]] = _slot_rgb(slot_elm)
+            clr_map_elm = master_part._element.find(qn("p:clrMap"))
+            clr_map = dict(DEFAULT_CLR_MAP)
+            if clr_map_elm is not None:
+                clr_map.update(clr_map_elm.attrib)
+            scheme = cls(slots, clr_map)
+            _SCHEMES[master_part] = scheme
+        return scheme
+
+    def with_clr_map(self, clr_map):
+        key = tuple(sorted(clr_map.items()))
+        scheme = self._overrides.get(key)
+        if scheme is None:
+            scheme = ColorScheme(self.slots, {**self.clr_map, **clr_map})
+            self._overrides[key] = scheme
+        return scheme
+
+    def resolve(self, val, transforms=()):
+        """RGB hex for a schemeClr `val` (bg1, tx1, accent1, dk1...) or None if unresolvable."""
+        key = (val, transforms)
+        if key in self._resolved:
+            return self._resolved[key]
+        slot = self.clr_map.get(val, val)
+        hex_rgb = self.slots.get(slot)
+        if hex_rgb is not None and transforms:
+            hex_rgb = apply_transforms(hex_rgb, transforms)
+        self._resolved[key] = hex_rgb
+        return hex_rgb
+
+
+class ThemeColorResolver:
+    """Per-slide entry point; the master's ColorScheme is looked up only when a theme color is met."""
+
+    def __init__(self, slide):
+        self._slide = slide
+        self._scheme = None
+
+    @property
+    def scheme(self):
+        if self._scheme is None:
+            master_part = self._slide.slide_layout.slide_master.part
+            scheme = ColorScheme.from_master_part(master_part)
+            override = self._slide._element.find(f"{qn('p:clrMapOvr')}/{qn('a:overrideClrMapping')}")
+            if override is not None:
+                scheme = scheme.with_clr_map(dict(override.attrib))
+            self._scheme = scheme
+        return self._scheme
+
+    def resolve_element(self, scheme_clr):
+        """RGB hex for an a:schemeClr element, applying its lumMod/lumOff/tint/shade children."""
+        transforms = tuple(
+            (TRANSFORM_TAGS[child.tag], int(child.get("val")))
+            for child in scheme_clr if child.tag in TRANSFORM_TAGS)
+        return self.scheme.resolve(scheme_clr.get("val"), transforms)
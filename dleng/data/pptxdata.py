@@ -91,6 +91,7 @@ class DL_Image:
     ext: str                       # ví dụ: "png"
     content_type: str              # ví dụ: "image/png"
     size: int                      # kích thước byte
+    thumbnail: Optional[str] = None  # ví dụ: "asset/thumb/<sha1>_256x256.png"
 
 @dataclass
 class DL_Shape:
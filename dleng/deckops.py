@@ -0,0 +1,344 @@
+# Tách / gộp deck ở mức package (copy part + remap relationship), không dump/build lại
+import hashlib
+import os
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from opc import CONTENT_TYPES_PART
+from opc import ContentTypes
+from opc import NS
+from opc import RT_NOTES_SLIDE
+from opc import RT_SLIDE
+from opc import RT_SLIDE_LAYOUT
+from opc import RT_SLIDE_MASTER
+from opc import main_document_part_name
+from opc import parse_rels
+from opc import parse_xml
+from opc import qn
+from opc import rels_part_name
+from opc import serialize_rels
+from opc import serialize_xml
+from opc import slide_part_names
+
+MEDIA_DIR = "ppt/media/"
+SLIDE_PART_TMPL = "ppt/slides/slide.xml"
+NUMBERED_NAME_RE = re.compile(r"^(.*?)(\d*)(\.[^./]+)$")
+# Thứ tự các phần tử đứng trước p:sldIdLst trong p:presentation
+ELEMENTS_BEFORE_SLD_ID_LST = ("p:sldMasterIdLst", "p:notesMasterIdLst", "p:handoutMasterIdLst")
+HYPERLINK_TAGS = frozenset(qn(tag) for tag in ("a:hlinkClick", "a:hlinkHover"))
+R_ATTR_PREFIX = f"{{{NS['r']}}}"
+
+
+def _source_of_rels(rels_name):
+    directory, base = posixpath.split(rels_name)
+    return posixpath.join(posixpath.dirname(directory), base[:-len(".rels")])
+
+
+class PackageGraph:
+    """Member list, content types and relationships of a pptx, parsed once without loading parts."""
+
+    def __init__(self, pptx_path):
+        self.path = pptx_path
+        with zipfile.ZipFile(pptx_path) as zf:
+            self.members = zf.namelist()
+            self.content_types = ContentTypes(zf.read(CONTENT_TYPES_PART))
+            self.rels = {}
+            for name in self.members:
+                if name.endswith(".rels") and posixpath.basename(posixpath.dirname(name)) == "_rels":
+                    source = _source_of_rels(name)
+                    self.rels[source] = parse_rels(source, zf.read(name))
+            self.presentation_part = main_document_part_name(zf)
+            self.presentation_blob = zf.read(self.presentation_part)
+            self.slides = slide_part_names(
+                zf, self.presentation_part, parse_xml(self.presentation_blob))
+
+    def reachable(self, rels_override=None):
+        """Part names reachable from the package relationships."""
+        rels_override = rels_override or {}
+        members = set(self.members)
+        seen = set()
+        stack = [""]
+        while stack:
+            source = stack.pop()
+            rels = rels_override.get(source, self.rels.get(source, {}))
+            for _, target, external in rels.values():
+                if external or target in seen or target not in members:
+                    continue
+                seen.add(target)
+                stack.append(target)
+        return seen
+
+
+# ---------------------------------------------------------------------------
+# Split
+# ---------------------------------------------------------------------------
+
+def _prune_slide_links(rels, keep_slides):
+    return {rId: rel for rId, rel in rels.items()
+            if rel[0] != RT_SLIDE or rel[2] or rel[1] in keep_slides}
+
+
+def _drop_relationship_references(root, rIds):
+    """Remove hyperlinks using the dropped relationships `rIds` (and any other r:* reference to them)."""
+    for elm in list(root.iter()):
+        for attr, value in list(elm.attrib.items()):
+            if value not in rIds or not attr.startswith(R_ATTR_PREFIX):
+                continue
+            if elm.tag in HYPERLINK_TAGS and elm.getparent() is not None:
+                elm.getparent().remove(elm)
+                break
+            del elm.attrib[attr]
+
+
+def _write_single_slide(graph, slide_idx, output_path):
+    keep_slides = {graph.slides[slide_idx]}
+    pres_part = graph.presentation_part
+    # Bỏ mọi relationship tới slide khác (sldIdLst, nút "jump to slide", ...) để không kéo theo part của chúng
+    pruned_rels = {}
+    for source, rels in graph.rels.items():
+        kept = _prune_slide_links(rels, keep_slides)
+        if len(kept) != len(rels):
+            pruned_rels[source] = kept
+
+    presentation = parse_xml(graph.presentation_blob)
+    kept_rIds = set(pruned_rels.get(pres_part, graph.rels.get(pres_part, {})))
+    sld_id_lst = presentation.find(qn("p:sldIdLst"))
+    for sld_id in list(sld_id_lst):
+        if sld_id.get(qn("r:id")) not in kept_rIds:
+            sld_id_lst.remove(sld_id)
+    # custom show tham chiếu tới các slide đã bị bỏ
+    cust_show_lst = presentation.find(qn("p:custShowLst"))
+    if cust_show_lst is not None:
+        presentation.remove(cust_show_lst)
+
+    reachable = graph.reachable(pruned_rels)
+    content_types = ContentTypes(graph.content_types.to_xml())
+    for name in graph.members:
+        if name not in reachable and name != CONTENT_TYPES_PART and not name.endswith(".rels"):
+            content_types.remove(name)
+
+    with zipfile.ZipFile(graph.path) as zin, \
+            zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            name = info.filename
+            if name == CONTENT_TYPES_PART:
+                zout.writestr(info, content_types.to_xml())
+            elif name.endswith(".rels"):
+                source = _source_of_rels(name)
+                if source in pruned_rels and (source == "" or source in reachable):
+                    zout.writestr(info, serialize_rels(source, pruned_rels[source]))
+                elif source == "" or source in reachable:
+                    zout.writestr(info, zin.read(info))
+            elif name == pres_part:
+                zout.writestr(info, serialize_xml(presentation))
+            elif name in reachable and name in pruned_rels:
+                root = parse_xml(zin.read(info))
+                _drop_relationship_references(
+                    root, set(graph.rels[name]) - set(pruned_rels[name]))
+                zout.writestr(info, serialize_xml(root))
+            elif name in reachable:
+                zout.writestr(info, zin.read(info))
+    return output_path
+
+
+def split_deck(pptx_path, output_dir, slide_numbers=None, max_workers=None):
+    """Write one pptx per slide (1-based `slide_numbers`, default all) in parallel; returns the paths."""
+    graph = PackageGraph(pptx_path)
+    if slide_numbers is None:
+        slide_numbers = range(1, len(graph.slides) + 1)
+    for slide_number in slide_numbers:
+        if not 1 <= slide_number <= len(graph.slides):
+            raise ValueError(f"[Slide {slide_number}] không tồn tại (deck có {len(graph.slides)} slide)")
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(pptx_path))[0]
+    jobs = [(slide_number - 1, os.path.join(output_dir, f"{stem}_slide{slide_number:03d}.pptx"))
+            for slide_number in slide_numbers]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda job: _write_single_slide(graph, *job), jobs))
+
+
+# ---------------------------------------------------------------------------
+# Merge
+# ---------------------------------------------------------------------------
+
+def _layout_info(zf, graph):
+    """{layout part: (name, type)} for every layout of every slide master."""
+    layouts = {}
+    for reltype, master, _ in graph.rels.get(graph.presentation_part, {}).values():
+        if reltype != RT_SLIDE_MASTER:
+            continue
+        for layout_type, layout, external in graph.rels.get(master, {}).values():
+            if external or layout_type != RT_SLIDE_LAYOUT or layout in layouts:
+                continue
+            root = parse_xml(zf.read(layout))
+            c_sld = root.find(qn("p:cSld"))
+            layouts[layout] = (c_sld.get("name") if c_sld is not None else None, root.get("type"))
+    return layouts
+
+
+def _plan_deck(pptx_path):
+    graph = PackageGraph(pptx_path)
+    with zipfile.ZipFile(pptx_path) as zf:
+        layouts = _layout_info(zf, graph)
+        slide_layouts = {}
+        for slide in graph.slides:
+            for reltype, target, external in graph.rels.get(slide, {}).values():
+                if reltype == RT_SLIDE_LAYOUT and not external:
+                    if target not in layouts:
+                        root = parse_xml(zf.read(target))
+                        c_sld = root.find(qn("p:cSld"))
+                        layouts[target] = (c_sld.get("name") if c_sld is not None else None, root.get("type"))
+                    slide_layouts[slide] = target
+        media_hashes = {}
+        for name in graph.members:
+            if name.startswith(MEDIA_DIR):
+                with zf.open(name) as f:
+                    media_hashes[name] = hashlib.sha1(f.read()).hexdigest()
+    return {"graph": graph, "layouts": layouts, "slide_layouts": slide_layouts, "media_hashes": media_hashes}
+
+
+class _MergeWriter:
+    def __init__(self, base_plan, zout):
+        self.zout = zout
+        graph = base_plan["graph"]
+        self.used_names = set(graph.members)
+        self.content_types = ContentTypes(graph.content_types.to_xml())
+        self.media_by_hash = {digest: name for name, digest in base_plan["media_hashes"].items()}
+        self.layouts_by_name = {}
+        self.layouts_by_type = {}
+        for layout, (name, layout_type) in base_plan["layouts"].items():
+            self.layouts_by_name.setdefault(name, layout)
+            self.layouts_by_type.setdefault(layout_type, layout)
+        self.default_layout = next(iter(base_plan["layouts"]), None)
+        self._next_index = {}
+
+    def unique_name(self, name):
+        match = NUMBERED_NAME_RE.match(name)
+        stem, ext = (match.group(1), match.group(3)) if match else (name, "")
+        n = self._next_index.get((stem, ext), 1)
+        while f"{stem}{n}{ext}" in self.used_names:
+            n += 1
+        self._next_index[(stem, ext)] = n + 1
+        new_name = f"{stem}{n}{ext}"
+        self.used_names.add(new_name)
+        return new_name
+
+    def map_layout(self, name, layout_type):
+        layout = self.layouts_by_name.get(name) or self.layouts_by_type.get(layout_type) or self.default_layout
+        if layout is None:
+            raise ValueError("Deck gốc không có slide layout để gắn slide được gộp vào")
+        return layout
+
+    def write(self, name, blob):
+        self.zout.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), blob,
+                           compress_type=zipfile.ZIP_DEFLATED)
+
+    def copy_part(self, zin, plan, source, copied):
+        """Copy `source` (and what it relates to) from another deck; media are de-duplicated by hash."""
+        if source in copied:
+            return copied[source]
+        graph = plan["graph"]
+        digest = plan["media_hashes"].get(source)
+        if digest is not None and digest in self.media_by_hash:
+            copied[source] = self.media_by_hash[digest]
+            return copied[source]
+        new_name = self.unique_name(source)
+        copied[source] = new_name
+        if digest is not None:
+            self.media_by_hash[digest] = new_name
+        self.write(new_name, zin.read(source))
+        self.content_types.add(new_name, graph.content_types.content_type(source))
+        rels = graph.rels.get(source)
+        if rels:
+            new_rels = {}
+            for rId, (reltype, target, external) in rels.items():
+                if external:
+                    new_rels[rId] = (reltype, target, True)
+                elif target in graph.members:
+                    new_rels[rId] = (reltype, self.copy_part(zin, plan, target, copied), False)
+            self.write(rels_part_name(new_name), serialize_rels(new_name, new_rels))
+        return new_name
+
+    def append_deck(self, plan):
+        """Append every slide of a planned deck; returns the new slide part names."""
+        graph = plan["graph"]
+        slide_map = {slide: self.unique_name(SLIDE_PART_TMPL) for slide in graph.slides}
+        copied = {}
+        with zipfile.ZipFile(graph.path) as zin:
+            for slide, new_slide in slide_map.items():
+                new_rels = {}
+                for rId, (reltype, target, external) in graph.rels.get(slide, {}).items():
+                    if external:
+                        new_rels[rId] = (reltype, target, True)
+                    elif reltype == RT_SLIDE_LAYOUT:
+                        new_rels[rId] = (reltype, self.map_layout(*plan["layouts"][target]), False)
+                    elif reltype == RT_NOTES_SLIDE:
+                        # notes cần notesMaster riêng của deck nguồn -> bỏ qua khi gộp
+                        continue
+                    elif reltype == RT_SLIDE:
+                        if target in slide_map:
+                            new_rels[rId] = (reltype, slide_map[target], False)
+                    elif target in graph.members:
+                        new_rels[rId] = (reltype, self.copy_part(zin, plan, target, copied), False)
+                self.write(new_slide, zin.read(slide))
+                self.write(rels_part_name(new_slide), serialize_rels(new_slide, new_rels))
+                self.content_types.add(new_slide, graph.content_types.content_type(slide))
+        return list(slide_map.values())
+
+
+def _sld_id_lst(presentation):
+    sld_id_lst = presentation.find(qn("p:sldIdLst"))
+    if sld_id_lst is None:
+        sld_id_lst = presentation.makeelement(qn("p:sldIdLst"))
+        anchor = None
+        for tag in ELEMENTS_BEFORE_SLD_ID_LST:
+            elm = presentation.find(qn(tag))
+            if elm is not None:
+                anchor = elm
+        if anchor is not None:
+            anchor.addnext(sld_id_lst)
+        else:
+            presentation.insert(0, sld_id_lst)
+    return sld_id_lst
+
+
+def merge_decks(pptx_paths, output_path, max_workers=None):
+    """Concatenate decks into `output_path`. The first deck provides masters, layouts and theme;
+    slides of the other decks are attached to the base layout with the same name (or type)."""
+    if not pptx_paths:
+        raise ValueError("Cần ít nhất một deck để gộp")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        plans = list(pool.map(_plan_deck, pptx_paths))
+    base_plan = plans[0]
+    base = base_plan["graph"]
+    pres_part = base.presentation_part
+    pres_rels_name = rels_part_name(pres_part)
+    presentation = parse_xml(base.presentation_blob)
+    pres_rels = dict(base.rels.get(pres_part, {}))
+    sld_id_lst = _sld_id_lst(presentation)
+    next_sld_id = max([int(sld_id.get("id")) for sld_id in sld_id_lst] + [255]) + 1
+    next_rId = max([int(rId[3:]) for rId in pres_rels if rId[3:].isdigit()] + [0]) + 1
+
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        writer = _MergeWriter(base_plan, zout)
+        with zipfile.ZipFile(base.path) as zin:
+            for info in zin.infolist():
+                if info.filename not in (CONTENT_TYPES_PART, pres_part, pres_rels_name):
+                    zout.writestr(info, zin.read(info))
+
+        for plan in plans[1:]:
+            for new_slide in writer.append_deck(plan):
+                rId = f"rId{next_rId}"
+                next_rId += 1
+                pres_rels[rId] = (RT_SLIDE, new_slide, False)
+                sld_id = sld_id_lst.makeelement(qn("p:sldId"))
+                sld_id.set("id", str(next_sld_id))
+                sld_id.set(qn("r:id"), rId)
+                sld_id_lst.append(sld_id)
+                next_sld_id += 1
+
+        writer.write(pres_part, serialize_xml(presentation))
+        writer.write(pres_rels_name, serialize_rels(pres_part, pres_rels))
+        writer.write(CONTENT_TYPES_PART, writer.content_types.to_xml())
+    return output_path
@@ -1,15 +1,24 @@
 # Refactored version of dump.py focusing on modularization
 import hashlib
+import inspect
 import json
 import os
-from pptx import Presentation
+import time
+from lxml import etree
 from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.enum.dml import MSO_COLOR_TYPE
 from pptx.enum.text import PP_ALIGN
 from pptx.enum.text import MSO_VERTICAL_ANCHOR
+from pptx.oxml.simpletypes import ST_TextWrappingType
 from pptx.oxml.ns import qn
 from pptx.dml.fill import _NoFill
 from pptx.dml.fill import _NoneFill
 from pptx.shapes.picture import Picture
+from asset import AssetWriter
+from package import open_lazy_package
+from memo import XmlMemo
+from color import ThemeColorResolver
+import metrics
 
 SHAPE_TYPES_WITH_FILL_LINE = {
     MSO_SHAPE_TYPE.AUTO_SHAPE,
@@ -27,6 +36,30 @@ TAG_MAP = {
     "diagonal_down": "lnTlToBr",
     "diagonal_up": "lnBlToTr"
 }
+# Thuộc tính tạo proxy mới, đọc cả cây con hoặc đã được dump riêng -> bỏ qua khi debug
+DEBUG_SKIP_ATTRS = {
+    "part", "element", "ln", "shapes", "click_action", "shadow", "fill", "line",
+    "image", "text_frame", "table", "chart", "chart_part", "ole_format",
+    "placeholder_format", "adjustments", "font", "paragraphs", "runs",
+    "rows", "columns", "crop_left", "crop_right", "crop_top", "crop_bottom"
+}
+DEBUG_MODES = ("schema", "xml", "deep")
+# Kết quả extract cho a:pPr / a:bodyPr / a:tcPr giống nhau được dùng lại (theo deck hoặc theo batch)
+PARAGRAPH_FORMAT_MEMO = XmlMemo("paragraph_format", copy=dict)
+TEXT_FRAME_FORMAT_MEMO = XmlMemo(
+    "text_frame_format", copy=lambda info: {**info, "margin": dict(info["margin"])})
+CELL_BORDER_MEMO = XmlMemo(
+    "cell_border", copy=lambda borders: {side: dict(info) for side, info in borders.items()})
+FORMAT_MEMOS = (PARAGRAPH_FORMAT_MEMO, TEXT_FRAME_FORMAT_MEMO, CELL_BORDER_MEMO)
+_DEBUG_SCHEMA_CACHE = {}
+
+
+class DumpError(ValueError):
+    """ValueError tagged with a failure category (group_shape, missing_font, theme_color, missing_fill...)."""
+
+    def __init__(self, message, category="other"):
+        super().__init__(message)
+        self.category = category
 
 
 def safe_deep_dump(obj, max_depth=2, _visited=None, _depth=0):
@@ -54,7 +87,58 @@ def safe_deep_dump(obj, max_depth=2, _visited=None, _depth=0):
     return result
 
 
-def get_rgb_safe(color_obj, context="(unknown context)"):
+def get_debug_schema(obj_type):
+    """Readable (non-callable, non-skipped) public attribute names of a type, cached per type."""
+    schema = _DEBUG_SCHEMA_CACHE.get(obj_type)
+    if schema is None:
+        schema = []
+        for attr in dir(obj_type):
+            if attr.startswith("_") or attr in DEBUG_SKIP_ATTRS:
+                continue
+            static_value = inspect.getattr_static(obj_type, attr, None)
+            if inspect.isroutine(static_value) or isinstance(static_value, (type, staticmethod, classmethod)):
+                continue
+            schema.append(attr)
+        schema = tuple(schema)
+        _DEBUG_SCHEMA_CACHE[obj_type] = schema
+    return schema
+
+
+def schema_dump(obj, max_depth=2, _depth=0):
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    if _depth >= max_depth:
+        return f"<{type(obj).__name__}>"
+    result = {}
+    for attr in get_debug_schema(type(obj)):
+        try:
+            value = getattr(obj, attr)
+        except Exception as e:
+            result[attr] = f"[Error: {e}]"
+            continue
+        if callable(value):
+            continue
+        result[attr] = schema_dump(value, max_depth, _depth + 1)
+    return result
+
+
+def debug_capture(shape, mode="schema", max_depth=2):
+    if mode == "schema":
+        return schema_dump(shape, max_depth=max_depth)
+    if mode == "xml":
+        return etree.tostring(shape._element, encoding="unicode")
+    if mode == "deep":
+        return safe_deep_dump(shape, max_depth=max_depth)
+    raise ValueError(f"debug_mode không hợp lệ: {mode} (hỗ trợ {', '.join(DEBUG_MODES)})")
+
+
+def resolve_theme_rgb(color_obj, colors):
+    if colors is None or color_obj.type != MSO_COLOR_TYPE.SCHEME:
+        return None
+    return colors.resolve_element(color_obj._color._xClr)
+
+
+def get_rgb_safe(color_obj, context="(unknown context)", colors=None):
     if color_obj is None:
         return "None"
     try:
@@ -62,6 +146,9 @@ def get_rgb_safe(color_obj, context="(unknown context)"):
             return f"RGB:{color_obj.rgb}"
     except AttributeError:
         pass
+    theme_rgb = resolve_theme_rgb(color_obj, colors)
+    if theme_rgb:
+        return f"RGB:{theme_rgb}"
     try:
         if color_obj.theme_color:
             theme_name = color_obj.theme_color.name
@@ -69,12 +156,13 @@ def get_rgb_safe(color_obj, context="(unknown context)"):
                 f"{context} – sử dụng màu theo theme ({theme_name}) mà không có RGB cụ thể.")
     except:
         pass
-    raise ValueError(f"{context} – không xác định được màu fill/font.")
+    category = "theme_color" if getattr(color_obj, "type", None) == MSO_COLOR_TYPE.SCHEME else "missing_color"
+    raise DumpError(f"{context} – không xác định được màu fill/font.", category)
 
 
-def extract_shape_border_info(shape, context):
+def extract_shape_border_info(shape, context, colors=None):
     if not hasattr(shape, "line") or shape.line is None:
-        raise ValueError(f"{context} không có shape.line")
+        raise DumpError(f"{context} không có shape.line", "missing_line")
     line = shape.line
     line_fill = line.fill
     no_outline = line_fill is None or line_fill.type is None or isinstance(
@@ -84,68 +172,61 @@ def extract_shape_border_info(shape, context):
             if line_fill.fore_color is None or line_fill.fore_color.rgb is None:
                 no_outline = True
         except AttributeError:
-            no_outline = True
+            no_outline = resolve_theme_rgb(line_fill.fore_color, colors) is None
     if no_outline:
         return {"color": "None", "width_pt": "Default", "style": "None"}
     return {
-        "color": get_rgb_safe(line.color, context=f"{context} border.color"),
+        "color": get_rgb_safe(line.color, context=f"{context} border.color", colors=colors),
         "width_pt": round(line.width / 12700, 2) if line.width else "Default",
         "style": str(line.dash_style) if line.dash_style else "None"
     }
 
 
-def extract_run_info(run, context):
+def extract_run_info(run, context, colors=None):
     font = run.font
     font_size_pt = font.size.pt if font.size else None
     if font_size_pt is None:
-        raise ValueError(f"{context} thiếu font size rõ ràng")
+        raise DumpError(f"{context} thiếu font size rõ ràng", "missing_font")
     font_name = font.name or (font._element.get(
         "typeface") if font._element is not None else None)
     if font_name is None:
-        raise ValueError(f"{context} thiếu font name rõ ràng")
+        raise DumpError(f"{context} thiếu font name rõ ràng", "missing_font")
     return {
         "text": run.text,
         "font_name": font_name,
         "font_size": font_size_pt,
         "bold": font.bold,
         "italic": font.italic,
-        "font_color": get_rgb_safe(font.color, context=context)
+        "font_color": get_rgb_safe(font.color, context=context, colors=colors)
     }
 
 
-def extract_paragraph_info(paragraph, context):
-    alignment_val = paragraph.alignment or PP_ALIGN.LEFT
+def extract_paragraph_format(pPr):
+    alignment_val = pPr.algn or PP_ALIGN.LEFT
     para_info = {
         "alignment": alignment_val,
-        "runs": [],
-        "bullet": paragraph.level,
+        "bullet": pPr.lvl,
         "bullet_type": None
     }
 
-    if paragraph.level is not None:
-        if paragraph._pPr is not None:
-            buChar = paragraph._pPr.find(qn("a:buChar"))
-            buAutoNum = paragraph._pPr.find(qn("a:buAutoNum"))
-            if buChar is not None:
-                para_info["bullet_type"] = "char"
-                para_info["bullet_char"] = buChar.attrib.get("char", "")
-            elif buAutoNum is not None:
-                para_info["bullet_type"] = "number"
-                para_info["number_type"] = buAutoNum.attrib.get("type", "arabicPeriod")
-    
-    if paragraph._pPr is not None:
-        marL = paragraph._pPr.attrib.get("marL")
-        indent = paragraph._pPr.attrib.get("indent")
-        level = paragraph._pPr.attrib.get("lvl")
-        para_info["level"] = int(level) if level is not None else 0
-        para_info["left_indent"] = round(int(marL) / 12700, 2) if marL else None
-        para_info["first_line_indent"] = round(int(indent) / 12700, 2) if indent else None
-    else:
-        para_info["left_indent"] = None
-        para_info["first_line_indent"] = None
-        para_info["level"] = None
-
-    lnSpc = paragraph._pPr.find(qn("a:lnSpc"))
+    if pPr.lvl is not None:
+        buChar = pPr.find(qn("a:buChar"))
+        buAutoNum = pPr.find(qn("a:buAutoNum"))
+        if buChar is not None:
+            para_info["bullet_type"] = "char"
+            para_info["bullet_char"] = buChar.attrib.get("char", "")
+        elif buAutoNum is not None:
+            para_info["bullet_type"] = "number"
+            para_info["number_type"] = buAutoNum.attrib.get("type", "arabicPeriod")
+
+    marL = pPr.attrib.get("marL")
+    indent = pPr.attrib.get("indent")
+    level = pPr.attrib.get("lvl")
+    para_info["level"] = int(level) if level is not None else 0
+    para_info["left_indent"] = round(int(marL) / 12700, 2) if marL else None
+    para_info["first_line_indent"] = round(int(indent) / 12700, 2) if indent else None
+
+    lnSpc = pPr.find(qn("a:lnSpc"))
     if lnSpc is not None:
         spcPct = lnSpc.find(qn("a:spcPct"))
         if spcPct is not None and "val" in spcPct.attrib:
@@ -154,21 +235,28 @@ def extract_paragraph_info(paragraph, context):
             para_info["line_spacing"] = None
     else:
         para_info["line_spacing"] = None
+    return para_info
+
+
+def extract_paragraph_info(paragraph, context, colors=None):
+    para_format = PARAGRAPH_FORMAT_MEMO.get(paragraph._pPr, extract_paragraph_format)
+    para_info = {"alignment": para_format["alignment"], "runs": []}
+    para_info.update(para_format)
 
     for run_idx, run in enumerate(paragraph.runs):
         run_ctx = f"{context} - Run {run_idx+1}"
-        run_info = extract_run_info(run, run_ctx)
+        run_info = extract_run_info(run, run_ctx, colors)
         run_info["run_index"] = run_idx + 1
         para_info["runs"].append(run_info)
     return para_info
 
 
-def extract_cell_text_detail(cell, slide_idx, shape_idx, r_idx, c_idx):
+def extract_cell_text_detail(cell, slide_idx, shape_idx, r_idx, c_idx, colors=None):
     context = f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})]"
     detail = []
     for p_idx, para in enumerate(cell.text_frame.paragraphs):
         para_ctx = f"{context} - Para {p_idx+1}"
-        para_info = extract_paragraph_info(para, para_ctx)
+        para_info = extract_paragraph_info(para, para_ctx, colors)
         para_info["paragraph_index"] = p_idx + 1
         detail.append(para_info)
     return {
@@ -177,8 +265,15 @@ def extract_cell_text_detail(cell, slide_idx, shape_idx, r_idx, c_idx):
     }
 
 
-def extract_cell_border(cell, slide_idx, shape_idx, r_idx, c_idx):
+def extract_cell_border(cell, slide_idx, shape_idx, r_idx, c_idx, colors=None):
     tcPr = cell._tc.tcPr
+    if colors is not None and tcPr is not None and tcPr.find(".//" + qn("a:schemeClr")) is not None:
+        return CELL_BORDER_MEMO.get(
+            tcPr, lambda el: extract_tcPr_borders(el, colors), scope=colors.scheme.key)
+    return CELL_BORDER_MEMO.get(tcPr, extract_tcPr_borders)
+
+
+def extract_tcPr_borders(tcPr, colors=None):
     borders = {}
     for side, tag in TAG_MAP.items():
         ln = tcPr.find(qn(f'a:{tag}'))
@@ -188,9 +283,14 @@ def extract_cell_border(cell, slide_idx, shape_idx, r_idx, c_idx):
             solid_fill = ln.find(qn("a:solidFill"))
             if solid_fill is not None:
                 srgb = solid_fill.find(qn("a:srgbClr"))
+                scheme_clr = solid_fill.find(qn("a:schemeClr"))
                 if srgb is not None:
                     hex_val = srgb.attrib.get("val")
                     border_info["color"] = f"RGB:{hex_val.upper()}"
+                elif scheme_clr is not None and colors is not None:
+                    hex_val = colors.resolve_element(scheme_clr)
+                    if hex_val:
+                        border_info["color"] = f"RGB:{hex_val}"
             if "w" in ln.attrib:
                 try:
                     border_info["width"] = round(
@@ -205,39 +305,56 @@ def extract_cell_border(cell, slide_idx, shape_idx, r_idx, c_idx):
 
 
 def extract_text_frame_format(text_frame):
+    return TEXT_FRAME_FORMAT_MEMO.get(text_frame._bodyPr, extract_bodyPr_format)
+
+
+def extract_bodyPr_format(bodyPr):
     format_info = {}
 
     # Có wrap word không?
-    format_info["wrap"] = text_frame.word_wrap
+    format_info["wrap"] = {
+        ST_TextWrappingType.SQUARE: True,
+        ST_TextWrappingType.NONE: False,
+        None: None
+    }[bodyPr.wrap]
 
     # Auto-fit text?
     format_info["auto_fit"] = (
-        text_frame.auto_size is not None  # can be `None`, `TextAutoSize.SHAPE_TO_FIT_TEXT`, ...
+        bodyPr.autofit is not None  # can be `None`, `TextAutoSize.SHAPE_TO_FIT_TEXT`, ...
     )
 
     # Vertical alignment
-    if text_frame.vertical_anchor:
-        format_info["vertical_anchor"] = int(text_frame.vertical_anchor)
+    if bodyPr.anchor:
+        format_info["vertical_anchor"] = int(bodyPr.anchor)
     else:
         format_info["vertical_anchor"] = int(MSO_VERTICAL_ANCHOR.TOP)
 
     # Margins (EMU)
     format_info["margin"] = {
-        "left": text_frame.margin_left,
-        "right": text_frame.margin_right,
-        "top": text_frame.margin_top,
-        "bottom": text_frame.margin_bottom
+        "left": bodyPr.lIns,
+        "right": bodyPr.rIns,
+        "top": bodyPr.tIns,
+        "bottom": bodyPr.bIns
     }
 
     return format_info
 
 
-def extract_text_from_shape(shape, slide_idx, shape_idx, for_txt):
+def format_memo_stats():
+    return {memo.name: memo.stats() for memo in FORMAT_MEMOS}
+
+
+def clear_format_memos():
+    for memo in FORMAT_MEMOS:
+        memo.clear()
+
+
+def extract_text_from_shape(shape, slide_idx, shape_idx, for_txt, colors=None):
     tf = shape.text_frame
     paragraphs = []
     for p_idx, para in enumerate(tf.paragraphs):
         context = f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Paragraph {p_idx+1}]"
-        para_info = extract_paragraph_info(para, context)
+        para_info = extract_paragraph_info(para, context, colors)
         para_info["paragraph_index"] = p_idx + 1
         para_info["text"] = para.text.strip().replace("\n", "\\n") if for_txt else para.text.strip()
         paragraphs.append(para_info)
@@ -247,7 +364,7 @@ def extract_text_from_shape(shape, slide_idx, shape_idx, for_txt):
         "paragraphs": paragraphs
     }
 
-def extract_table_from_shape(shape, slide_idx, shape_idx, for_txt):
+def extract_table_from_shape(shape, slide_idx, shape_idx, for_txt, colors=None):
     tbl = shape.table
     num_rows = len(tbl.rows)
     num_cols = len(tbl.columns)
@@ -266,21 +383,24 @@ def extract_table_from_shape(shape, slide_idx, shape_idx, for_txt):
             table_data[r_idx][c_idx] = cell.text.strip().replace(
                 "\n", "\\n") if for_txt else cell.text.strip()
             table_data_detail[r_idx][c_idx] = extract_cell_text_detail(
-                cell, slide_idx, shape_idx, r_idx, c_idx)
+                cell, slide_idx, shape_idx, r_idx, c_idx, colors)
             if not hasattr(cell, "fill") or cell.fill is None or isinstance(cell.fill._fill, _NoneFill):
-                raise ValueError(
-                    f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})] thiếu fill")
+                raise DumpError(
+                    f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})] thiếu fill",
+                    "missing_fill")
 
             if not hasattr(cell, "fill") or cell.fill is None or not cell.fill.fore_color:
-                raise ValueError(
-                    f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})] thiếu fill")
+                raise DumpError(
+                    f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})] thiếu fill",
+                    "missing_fill")
             cell_fills[r_idx][c_idx] = get_rgb_safe(
-                cell.fill.fore_color, context=f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})]")
+                cell.fill.fore_color, context=f"[Slide {slide_idx+1} - Shape {shape_idx+1} - Cell ({r_idx+1},{c_idx+1})]",
+                colors=colors)
             if cell.span_height > 1 or cell.span_width > 1:
                 merge_info.append(
                     {"row": r_idx, "col": c_idx, "row_span": cell.span_height, "col_span": cell.span_width})
             cell_borders[r_idx][c_idx] = extract_cell_border(
-                cell, slide_idx, shape_idx, r_idx, c_idx)
+                cell, slide_idx, shape_idx, r_idx, c_idx, colors)
 
     col_widths = [col.width for col in tbl.columns]
     row_heights = [row.height for row in tbl.rows]
@@ -298,39 +418,82 @@ def extract_table_from_shape(shape, slide_idx, shape_idx, for_txt):
     }
 
 
-def extract_picture_info(shape: Picture, slide_idx, shape_idx, asset_dir):
+def extract_picture_info(shape: Picture, slide_idx, shape_idx, asset_writer: AssetWriter):
     image = shape.image
     ext = image.ext.strip(".")
     img_bytes = image.blob
 
     if not img_bytes:
-        raise ValueError(
-            f"[Slide {slide_idx+1} - Shape {shape_idx+1}] – Không có dữ liệu ảnh")
+        raise DumpError(
+            f"[Slide {slide_idx+1} - Shape {shape_idx+1}] – Không có dữ liệu ảnh", "missing_image")
 
     hash_part = hashlib.md5(img_bytes).hexdigest()[:8]
     export_name = f"img_slide{slide_idx+1}_shape{shape_idx+1}_{hash_part}.{ext}"
-    export_path = os.path.join(asset_dir, export_name)
-
-    with open(export_path, "wb") as f:
-        f.write(img_bytes)
 
-    return {
-        "filename": os.path.join("asset", export_name),
+    image_info = {
+        "filename": asset_writer.write(export_name, img_bytes),
         "ext": ext,
         "content_type": image.content_type,
         "size": len(img_bytes)
     }
+    thumbnail = asset_writer.thumbnail(img_bytes)
+    if thumbnail is not None:
+        image_info["thumbnail"] = thumbnail
+    return image_info
 
 
-def extract_slide_data(pptx_path, output_dir, for_txt=False, is_debug=False):
-    prs = Presentation(pptx_path)
-    slides = []
-
+def extract_slide_data(pptx_path, output_dir, for_txt=False, is_debug=False, debug_mode="schema",
+                       thumbnail_size=None, asset_workers=4, slide_numbers=None):
     asset_dir = os.path.join(output_dir, "asset")
-    os.makedirs(asset_dir, exist_ok=True)
+    started = time.perf_counter()
+    try:
+        with open_lazy_package(pptx_path) as package, \
+                AssetWriter(asset_dir, max_workers=asset_workers, thumbnail_size=thumbnail_size) as asset_writer:
+            data = _extract_slide_data(package.presentation, package.slides, asset_writer, for_txt,
+                                       is_debug, debug_mode, slide_numbers)
+        # Thumbnail render ở background -> chỉ biết cái nào lỗi sau khi AssetWriter đã flush
+        drop_failed_thumbnails(data, asset_writer.failed_thumbnails)
+    except Exception as e:
+        metrics.record_failure("dump", e, time.perf_counter() - started)
+        raise
+    metrics.record_success("dump", data, time.perf_counter() - started, asset_writer.bytes_written)
+    return data
+
+
+def drop_failed_thumbnails(data, failed_thumbnails):
+    """Remove thumbnail paths whose preview could not be rendered (images are kept)."""
+    if not failed_thumbnails:
+        return
+    for slide in data["slides"]:
+        for shape_info in slide["shapes"]:
+            image_info = shape_info.get("image")
+            if image_info and image_info.get("thumbnail") in failed_thumbnails:
+                image_info["thumbnail"] = None
+
+
+def iter_selected_slides(prs_slides, slide_numbers=None):
+    if slide_numbers is None:
+        yield from enumerate(prs_slides)
+        return
+    slide_numbers = list(slide_numbers)
+    seen = set()
+    for slide_number in slide_numbers:
+        if not 1 <= slide_number <= len(prs_slides):
+            raise ValueError(f"[Slide {slide_number}] không tồn tại (deck có {len(prs_slides)} slide)")
+        # Slide lặp lại sẽ ghi trùng tên asset từ nhiều thread
+        if slide_number in seen:
+            raise ValueError(f"[Slide {slide_number}] bị chọn nhiều lần trong slide_numbers")
+        seen.add(slide_number)
+    for slide_number in slide_numbers:
+        yield slide_number - 1, prs_slides[slide_number - 1]
+
+
+def _extract_slide_data(prs, prs_slides, asset_writer, for_txt, is_debug, debug_mode, slide_numbers):
+    slides = []
 
-    for i, slide in enumerate(prs.slides):
+    for i, slide in iter_selected_slides(prs_slides, slide_numbers):
         slide_info = {"slide_number": i + 1, "shapes": []}
+        colors = ThemeColorResolver(slide)
         for j, shape in enumerate(slide.shapes):
             shape_info = {
                 "shape_index": j + 1,
@@ -348,34 +511,35 @@ def extract_slide_data(pptx_path, output_dir, for_txt=False, is_debug=False):
             }
 
             if is_debug:
-                shape_info["raw_attributes"] = safe_deep_dump(
-                    shape, max_depth=2)
+                shape_info["raw_attributes"] = debug_capture(
+                    shape, mode=debug_mode, max_depth=2)
 
             shape_type = shape.shape_type
 
             if shape_type == MSO_SHAPE_TYPE.GROUP:
-                raise ValueError(
-                    f"[Slide {slide_info}] – Không hỗ trợ dump cho shape kiểu group, vui lòng bỏ group")
+                raise DumpError(
+                    f"[Slide {slide_info}] – Không hỗ trợ dump cho shape kiểu group, vui lòng bỏ group",
+                    "group_shape")
 
             has_visual_style = shape_type in SHAPE_TYPES_WITH_FILL_LINE
 
             if has_visual_style and hasattr(shape, "fill") and shape.fill and shape.fill.fore_color:
                 shape_info["background_fill_color"] = get_rgb_safe(
-                    shape.fill.fore_color, context=f"[Slide {i+1} - Shape {j+1}] fill")
+                    shape.fill.fore_color, context=f"[Slide {i+1} - Shape {j+1}] fill", colors=colors)
                 shape_info["border"] = extract_shape_border_info(
-                    shape, context=f"[Slide {i+1} - Shape {j+1}]")
+                    shape, context=f"[Slide {i+1} - Shape {j+1}]", colors=colors)
 
             if shape.has_text_frame:
                 shape_info["text"] = extract_text_from_shape(
-                    shape, i, j, for_txt)
+                    shape, i, j, for_txt, colors)
 
             if shape_type == MSO_SHAPE_TYPE.TABLE:
                 shape_info["table"] = extract_table_from_shape(
-                    shape, i, j, for_txt)
+                    shape, i, j, for_txt, colors)
 
             if shape_type == MSO_SHAPE_TYPE.PICTURE:
                 shape_info["image"] = extract_picture_info(
-                    shape, i, j, asset_dir)
+                    shape, i, j, asset_writer)
 
             slide_info["shapes"].append(shape_info)
         slides.append(slide_info)
@@ -387,13 +551,13 @@ def extract_slide_data(pptx_path, output_dir, for_txt=False, is_debug=False):
     }
 
 
-def describe_pptx_to_json_with_assets(pptx_path, output_root_folder):
+def describe_pptx_to_json_with_assets(pptx_path, output_root_folder, thumbnail_size=None):
     slide_name = os.path.splitext(os.path.basename(pptx_path))[0]
     output_dir = os.path.join(output_root_folder, slide_name)
     os.makedirs(output_dir, exist_ok=True)
     json_path = os.path.join(output_dir, f"{slide_name}.json")
 
-    data = extract_slide_data(pptx_path, output_dir)
+    data = extract_slide_data(pptx_path, output_dir, thumbnail_size=thumbnail_size)
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
@@ -0,0 +1,216 @@
+# Điền form trực tiếp vào XML của template pptx (không dựng object graph python-pptx)
+import bisect
+import copy
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from opc import copy_member_raw
+from opc import iter_shape_elements
+from opc import parse_xml
+from opc import qn
+from opc import serialize_xml
+from opc import slide_part_names
+
+# Key của fields:
+#   (slide, shape)            -> toàn bộ text của shape
+#   (slide, shape, row, col)  -> text của ô table
+#   "token"                   -> thay chuỗi token (vd "{{invention_name}}") trong mọi a:t
+# Chỉ số bắt đầu từ 1 như slide_number / shape_index trong dump.
+
+
+def _split_fields(fields):
+    targeted = {}
+    tokens = {}
+    for key, value in fields.items():
+        value = "" if value is None else str(value)
+        if isinstance(key, str):
+            if not key:
+                raise ValueError("Token rỗng trong fields")
+            tokens[key] = value
+        elif isinstance(key, tuple) and len(key) in (2, 4):
+            slide_no = key[0]
+            targeted.setdefault(slide_no, []).append((key, value))
+        else:
+            raise ValueError(
+                f"Key không hợp lệ: {key!r} (cần (slide, shape), (slide, shape, row, col) hoặc token)")
+    return targeted, tokens
+
+
+def _new_run(paragraph):
+    run = paragraph.makeelement(qn("a:r"))
+    end_rPr = paragraph.find(qn("a:endParaRPr"))
+    if end_rPr is not None:
+        rPr = copy.deepcopy(end_rPr)
+        rPr.tag = qn("a:rPr")
+        run.append(rPr)
+    run.append(run.makeelement(qn("a:t")))
+    if end_rPr is not None:
+        end_rPr.addprevious(run)
+    else:
+        paragraph.append(run)
+    return run
+
+
+def set_paragraph_text(paragraph, text):
+    t_elements = paragraph.findall(f"{qn('a:r')}/{qn('a:t')}")
+    if not t_elements:
+        if not text:
+            return
+        t_elements = [_new_run(paragraph).find(qn("a:t"))]
+    t_elements[0].text = text
+    for t in t_elements[1:]:
+        t.text = ""
+    for br in paragraph.findall(qn("a:br")):
+        paragraph.remove(br)
+
+
+def set_text_body(tx_body, value, context):
+    if tx_body is None:
+        raise ValueError(f"{context} không có text frame")
+    paragraphs = tx_body.findall(qn("a:p"))
+    if not paragraphs:
+        raise ValueError(f"{context} không có paragraph")
+    lines = value.split("\n")
+    for line_idx, line in enumerate(lines):
+        if line_idx < len(paragraphs):
+            paragraph = paragraphs[line_idx]
+        else:
+            paragraph = copy.deepcopy(paragraphs[-1])
+            paragraphs[-1].addnext(paragraph)
+            paragraphs.append(paragraph)
+        set_paragraph_text(paragraph, line)
+    for paragraph in paragraphs[len(lines):]:
+        tx_body.remove(paragraph)
+
+
+def _shape_text_body(shape_elm):
+    return shape_elm.find(qn("p:txBody"))
+
+
+def _cell_text_body(shape_elm, row, col, context):
+    tbl = shape_elm.find(f"{qn('a:graphic')}/{qn('a:graphicData')}/{qn('a:tbl')}")
+    if tbl is None:
+        raise ValueError(f"{context} không phải table")
+    rows = tbl.findall(qn("a:tr"))
+    if not 1 <= row <= len(rows):
+        raise ValueError(f"{context} không có hàng {row} (table có {len(rows)} hàng)")
+    cells = rows[row - 1].findall(qn("a:tc"))
+    if not 1 <= col <= len(cells):
+        raise ValueError(f"{context} không có cột {col} (table có {len(cells)} cột)")
+    tc = cells[col - 1]
+    if tc.get("hMerge") == "1" or tc.get("vMerge") == "1":
+        raise ValueError(f"{context} là ô đã bị merge, hãy điền vào ô gốc")
+    return tc.find(qn("a:txBody"))
+
+
+def apply_targeted_fields(slide_root, slide_no, entries):
+    shapes = iter_shape_elements(slide_root)
+    for key, value in entries:
+        shape_no = key[1]
+        context = f"[Slide {slide_no} - Shape {shape_no}]"
+        if not 1 <= shape_no <= len(shapes):
+            raise ValueError(f"{context} không tồn tại (slide có {len(shapes)} shape)")
+        shape_elm = shapes[shape_no - 1]
+        if len(key) == 2:
+            set_text_body(_shape_text_body(shape_elm), value, context)
+        else:
+            row, col = key[2], key[3]
+            context = f"[Slide {slide_no} - Shape {shape_no} - Cell ({row},{col})]"
+            set_text_body(_cell_text_body(shape_elm, row, col, context), value, context)
+
+
+def _token_pattern(tokens):
+    # Token dài trước để "{{a_b}}" không bị "{{a" cắt mất
+    return re.compile("|".join(re.escape(token) for token in sorted(tokens, key=len, reverse=True)))
+
+
+def replace_tokens(slide_root, tokens):
+    """Replace tokens in a:t nodes in a single pass per paragraph.
+
+    A token split across runs is written into the run where it starts; only the runs it covers
+    are trimmed, other text of the paragraph keeps its own run formatting. Replacement values are
+    not scanned again.
+    """
+    pattern = _token_pattern(tokens)
+    replaced = 0
+    for paragraph in slide_root.iter(qn("a:p")):
+        t_elements = paragraph.findall(f"{qn('a:r')}/{qn('a:t')}")
+        if not t_elements:
+            continue
+        texts = [t.text or "" for t in t_elements]
+        matches = list(pattern.finditer("".join(texts)))
+        if not matches:
+            continue
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text)
+        # Từ cuối paragraph về đầu: sửa một match không làm lệch vị trí của các match đứng trước
+        for match in reversed(matches):
+            first = bisect.bisect_right(starts, match.start()) - 1
+            last = bisect.bisect_right(starts, match.end() - 1) - 1
+            head = texts[first][:match.start() - starts[first]]
+            tail = texts[last][match.end() - starts[last]:]
+            if first == last:
+                texts[first] = head + tokens[match.group()] + tail
+            else:
+                texts[first] = head + tokens[match.group()]
+                for idx in range(first + 1, last):
+                    texts[idx] = ""
+                texts[last] = tail
+            replaced += 1
+        for t, text in zip(t_elements, texts):
+            if text != (t.text or ""):
+                t.text = text
+    return replaced
+
+
+def fill_form(template_path, output_path, fields):
+    """Fill `fields` into a copy of `template_path`, touching only the slide XML parts involved.
+
+    The output is written to a temporary file next to `output_path` and moved into place, so
+    `output_path` may be the template itself. Untouched members are copied as their compressed
+    bytes; only the affected slide parts are recompressed.
+    """
+    targeted, tokens = _split_fields(fields)
+    with zipfile.ZipFile(template_path) as zin:
+        slide_names = slide_part_names(zin)
+        for slide_no in targeted:
+            if not 1 <= slide_no <= len(slide_names):
+                raise ValueError(
+                    f"[Slide {slide_no}] không tồn tại (template có {len(slide_names)} slide)")
+        affected = {}
+        for slide_idx, part_name in enumerate(slide_names):
+            slide_no = slide_idx + 1
+            if slide_no not in targeted and not tokens:
+                continue
+            slide_root = parse_xml(zin.read(part_name))
+            if slide_no in targeted:
+                apply_targeted_fields(slide_root, slide_no, targeted[slide_no])
+                changed = True
+            else:
+                changed = False
+            if tokens and replace_tokens(slide_root, tokens):
+                changed = True
+            if changed:
+                affected[part_name] = serialize_xml(slide_root)
+
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".tmp", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w") as zout:
+                for info in zin.infolist():
+                    blob = affected.get(info.filename)
+                    if blob is not None:
+                        zout.writestr(info, blob)
+                    else:
+                        copy_member_raw(zin, zout, info)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    shutil.copymode(template_path, tmp_path)
+    os.replace(tmp_path, output_path)
+    return output_path
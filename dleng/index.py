@@ -0,0 +1,234 @@
+# Full-text inverted index over dumped decks (output of extract_slide_data)
+import json
+import os
+import re
+import sqlite3
+import unicodedata
+
+TOKEN_RE = re.compile(r"\w+")
+PHRASE_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    deck_id INTEGER NOT NULL,
+    slide INTEGER NOT NULL,
+    shape INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    paragraph INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    PRIMARY KEY (term_id, deck_id, slide, shape, row, col, paragraph, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_location
+    ON postings (deck_id, slide, shape, row, col, paragraph, pos, term_id);
+"""
+
+# Cột định danh một vị trí text: paragraph của shape hoặc ô (row, col) của table.
+# Chỉ số bắt đầu từ 1 như trong dump, 0 nghĩa là không áp dụng.
+LOCATION_COLUMNS = ("deck_id", "slide", "shape", "row", "col", "paragraph")
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_RE.findall(unicodedata.normalize("NFC", text).casefold())
+
+
+def unescape_text(text):
+    # Dump với for_txt=True thay xuống dòng bằng "\\n" literal -> đổi lại để tokenize tách từ đúng
+    return text.replace("\\n", "\n")
+
+
+def iter_text_fields(data, for_txt=False):
+    """Yield (slide, shape, row, col, paragraph, text) for every text field of a dump.
+
+    Pass `for_txt=True` for dumps made with extract_slide_data(for_txt=True): their escaped
+    line breaks are restored. Other dumps are indexed as is (a literal "\\n" stays text).
+    """
+    unescape = unescape_text if for_txt else str
+    for slide in data.get("slides", []):
+        slide_no = slide["slide_number"]
+        for shape in slide.get("shapes", []):
+            shape_no = shape["shape_index"]
+            text = shape.get("text")
+            if isinstance(text, dict):
+                for para in text.get("paragraphs") or []:
+                    if para and para.get("text"):
+                        yield slide_no, shape_no, 0, 0, para["paragraph_index"], unescape(para["text"])
+            table = shape.get("table")
+            if table:
+                for r_idx, row in enumerate(table.get("data") or []):
+                    for c_idx, cell_text in enumerate(row):
+                        if cell_text:
+                            yield slide_no, shape_no, r_idx + 1, c_idx + 1, 0, unescape(cell_text)
+
+
+def parse_query(query):
+    """Split a query into clauses: quoted phrases, `prefix*` terms and plain terms."""
+    clauses = []
+    for phrase, word in PHRASE_RE.findall(query):
+        if phrase:
+            tokens = tokenize(phrase)
+            if tokens:
+                clauses.append(("phrase", tokens))
+        elif word.endswith("*"):
+            tokens = tokenize(word[:-1])
+            if len(tokens) == 1:
+                clauses.append(("prefix", tokens))
+            elif tokens:
+                clauses.append(("phrase", tokens[:-1]))
+                clauses.append(("prefix", tokens[-1:]))
+        else:
+            tokens = tokenize(word)
+            if len(tokens) == 1:
+                clauses.append(("term", tokens))
+            elif tokens:
+                clauses.append(("phrase", tokens))
+    return clauses
+
+
+class DeckIndex:
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._term_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_id(self, term):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO terms (term) VALUES (?)", (term,))
+            term_id = self.conn.execute(
+                "SELECT id FROM terms WHERE term = ?", (term,)).fetchone()[0]
+            self._term_ids[term] = term_id
+        return term_id
+
+    def add_deck(self, deck_name, data, for_txt=False):
+        """Index (or re-index) one deck. `data` is a dump dict or the path to its JSON;
+        `for_txt` tells whether it was dumped with for_txt=True."""
+        if isinstance(data, (str, os.PathLike)):
+            with open(data, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        try:
+            with self.conn:
+                self._remove(deck_name)
+                cur = self.conn.execute(
+                    "INSERT INTO decks (name) VALUES (?)", (deck_name,))
+                deck_id = cur.lastrowid
+                rows = []
+                for slide_no, shape_no, r, c, p, text in iter_text_fields(data, for_txt):
+                    for pos, token in enumerate(tokenize(text)):
+                        rows.append((self._term_id(token), deck_id,
+                                    slide_no, shape_no, r, c, p, pos))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except BaseException:
+            # Term mới trong transaction đã bị rollback -> id trong cache không còn hợp lệ
+            self._term_ids.clear()
+            raise
+
+    def remove_deck(self, deck_name):
+        with self.conn:
+            return self._remove(deck_name)
+
+    def _remove(self, deck_name):
+        row = self.conn.execute(
+            "SELECT id FROM decks WHERE name = ?", (deck_name,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute("DELETE FROM postings WHERE deck_id = ?", row)
+        self.conn.execute("DELETE FROM decks WHERE id = ?", row)
+        return True
+
+    def decks(self):
+        return [name for (name,) in self.conn.execute("SELECT name FROM decks ORDER BY name")]
+
+    def _clause_sql(self, kind, tokens):
+        """SQL returning the distinct locations matching one clause."""
+        loc = ", ".join(f"p0.{col}" for col in LOCATION_COLUMNS)
+        if kind == "prefix":
+            sql = (f"SELECT DISTINCT {loc} FROM postings p0 JOIN terms t0 ON t0.id = p0.term_id "
+                   "WHERE t0.term >= ? AND t0.term < ?")
+            return sql, [tokens[0], tokens[0] + "\U0010ffff"]
+        joins = []
+        where = []
+        params = []
+        for i, token in enumerate(tokens):
+            if i > 0:
+                same_loc = " AND ".join(
+                    f"p{i}.{col} = p0.{col}" for col in LOCATION_COLUMNS)
+                joins.append(
+                    f"JOIN postings p{i} ON {same_loc} AND p{i}.pos = p0.pos + {i}")
+            joins.append(f"JOIN terms t{i} ON t{i}.id = p{i}.term_id")
+            where.append(f"t{i}.term = ?")
+            params.append(token)
+        sql = f"SELECT DISTINCT {loc} FROM postings p0 {joins[0]} {' '.join(joins[1:])} WHERE {' AND '.join(where)}"
+        return sql, params
+
+    def search(self, query, limit=None):
+        """Search the index.
+
+        Query syntax: plain words (all must occur in the same paragraph/cell),
+        `"exact phrase"` and `prefix*`. Returns a list of postings
+        {deck, slide, shape, row, col, paragraph}.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+        parts = []
+        params = []
+        for kind, tokens in clauses:
+            sql, clause_params = self._clause_sql(kind, tokens)
+            parts.append(sql)
+            params.extend(clause_params)
+        sql = (f"SELECT d.name, m.slide, m.shape, m.row, m.col, m.paragraph "
+               f"FROM ({' INTERSECT '.join(parts)}) m JOIN decks d ON d.id = m.deck_id "
+               f"ORDER BY d.name, m.slide, m.shape, m.row, m.col, m.paragraph")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [
+            {
+                "deck": deck,
+                "slide": slide,
+                "shape": shape,
+                "row": row or None,
+                "col": col or None,
+                "paragraph": paragraph or None
+            }
+            for deck, slide, shape, row, col, paragraph in self.conn.execute(sql, params)
+        ]
+
+
+def index_dump_folder(index_path, output_root_folder, for_txt=False):
+    """Index every `<name>/<name>.json` produced by describe_pptx_to_json_with_assets."""
+    with DeckIndex(index_path) as index:
+        for name in sorted(os.listdir(output_root_folder)):
+            json_path = os.path.join(output_root_folder, name, f"{name}.json")
+            if os.path.isfile(json_path):
+                index.add_deck(name, json_path, for_txt)
+
+
+if __name__ == "__main__":
+    index_dump_folder(os.path.join("bin", "dleng_index.sqlite"), "bin")
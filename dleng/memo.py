@@ -0,0 +1,55 @@
+# Memo hoá kết quả extract theo nội dung XML (a:pPr, a:bodyPr, a:tcPr, ...)
+import hashlib
+from collections import OrderedDict
+from lxml import etree
+
+
+def canonical_hash(element):
+    """Hash of the exclusive-C14N form of an XML subtree (stable across documents)."""
+    return hashlib.blake2b(
+        etree.tostring(element, method="c14n", exclusive=True), digest_size=16).digest()
+
+
+class XmlMemo:
+    def __init__(self, name, maxsize=4096, copy=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def get(self, element, compute, scope=None):
+        """Return compute(element), reusing the result of a structurally identical element.
+
+        `scope` is added to the key when the result also depends on something outside the
+        element (e.g. the theme color scheme).
+        """
+        if element is None:
+            return compute(element)
+        key = (scope, canonical_hash(element))
+        try:
+            result = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            result = compute(element)
+            self._cache[key] = result
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return self.copy(result) if self.copy else result
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize
+        }
@@ -0,0 +1,237 @@
+# Metrics vận hành cho worker dump/build: counter + histogram, xuất Prometheus text hoặc JSON
+import json
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+def _label_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Labels {sorted(labels)} không khớp với khai báo {list(labelnames)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def snapshot(self):
+        return [{"labels": dict(zip(self.labelnames, key)), "value": value}
+                for key, value in sorted(self.values.items())]
+
+
+class Histogram:
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = {"counts": [0] * len(self.buckets), "sum": 0, "count": 0}
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                state["counts"][idx] += 1
+                break
+        state["sum"] += value
+        state["count"] += 1
+
+    def samples(self):
+        for key, state in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                yield (f"{self.name}_bucket",
+                       _format_labels(self.labelnames, key, [("le", _format_value(float(bound)))]),
+                       cumulative)
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), state["sum"]
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), state["count"]
+
+    def snapshot(self):
+        result = []
+        for key, state in sorted(self.values.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                buckets[_format_value(float(bound))] = cumulative
+            result.append({"labels": dict(zip(self.labelnames, key)), "buckets": buckets,
+                           "sum": state["sum"], "count": state["count"]})
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.enabled = False
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._metrics[name].inc(amount, **labels)
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._metrics[name].observe(value, **labels)
+
+    def reset(self):
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.values.clear()
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for metric in self._metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.type_name}")
+                for sample_name, labels, value in metric.samples():
+                    lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "metrics": {
+                    metric.name: {"type": metric.type_name, "help": metric.help,
+                                  "samples": metric.snapshot()}
+                    for metric in self._metrics.values()
+                }
+            }
+
+    def write_prometheus(self, path):
+        """Write the registry in Prometheus text format (atomic, for node_exporter textfile collector)."""
+        _write_atomic(path, self.to_prometheus())
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.snapshot(), indent=2, ensure_ascii=False))
+
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.counter("dleng_documents_total", "Documents processed.", ("operation", "status"))
+REGISTRY.counter("dleng_failures_total", "Failed documents by error category.", ("operation", "category"))
+REGISTRY.histogram("dleng_slides_per_document", "Slides per document.", ("operation",), COUNT_BUCKETS)
+REGISTRY.histogram("dleng_shapes_per_document", "Shapes per document.", ("operation",), COUNT_BUCKETS)
+REGISTRY.histogram("dleng_cells_per_document", "Table cells per document.", ("operation",), COUNT_BUCKETS)
+REGISTRY.counter("dleng_asset_bytes_total", "Bytes of assets written by dump.")
+REGISTRY.histogram("dleng_duration_seconds", "Dump/build latency in seconds.", ("operation",))
+
+
+def enable():
+    REGISTRY.enabled = True
+
+
+def disable():
+    REGISTRY.enabled = False
+
+
+def is_enabled():
+    return REGISTRY.enabled
+
+
+def count_document_items(data):
+    """(slides, shapes, cells) of a dump dict."""
+    slides = data.get("slides", [])
+    shapes = 0
+    cells = 0
+    for slide in slides:
+        for shape in slide.get("shapes", []):
+            shapes += 1
+            table = shape.get("table")
+            if table:
+                cells += table.get("rows", 0) * table.get("cols", 0)
+    return len(slides), shapes, cells
+
+
+def record_success(operation, data, seconds, asset_bytes=0):
+    if not REGISTRY.enabled:
+        return
+    slides, shapes, cells = count_document_items(data)
+    REGISTRY.inc("dleng_documents_total", operation=operation, status="ok")
+    REGISTRY.observe("dleng_slides_per_document", slides, operation=operation)
+    REGISTRY.observe("dleng_shapes_per_document", shapes, operation=operation)
+    REGISTRY.observe("dleng_cells_per_document", cells, operation=operation)
+    REGISTRY.observe("dleng_duration_seconds", seconds, operation=operation)
+    if asset_bytes:
+        REGISTRY.inc("dleng_asset_bytes_total", asset_bytes)
+
+
+def error_category(error):
+    category = getattr(error, "category", None)
+    if category:
+        return category
+    if isinstance(error, FileNotFoundError):
+        return "missing_asset"
+    return "other"
+
+
+def record_failure(operation, error, seconds):
+    if not REGISTRY.enabled:
+        return
+    REGISTRY.inc("dleng_documents_total", operation=operation, status="error")
+    REGISTRY.inc("dleng_failures_total", operation=operation,
+                 category=error_category(error))
+    REGISTRY.observe("dleng_duration_seconds", seconds, operation=operation)
@@ -0,0 +1,194 @@
+# Tiện ích đọc package pptx ở mức zip (part, relationship) không qua python-pptx
+import copy
+import posixpath
+import struct
+import zipfile
+from lxml import etree
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "pr": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "ct": "http://schemas.openxmlformats.org/package/2006/content-types",
+}
+RT_BASE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+RT_OFFICE_DOCUMENT = RT_BASE + "officeDocument"
+RT_SLIDE = RT_BASE + "slide"
+RT_SLIDE_LAYOUT = RT_BASE + "slideLayout"
+RT_SLIDE_MASTER = RT_BASE + "slideMaster"
+RT_THEME = RT_BASE + "theme"
+RT_NOTES_SLIDE = RT_BASE + "notesSlide"
+RT_IMAGE = RT_BASE + "image"
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+# Các phần tử con của p:spTree được python-pptx coi là shape (theo thứ tự slide.shapes)
+SHAPE_TAGS = frozenset(
+    f"{{{NS['p']}}}{tag}" for tag in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart"))
+
+XML_PARSER = etree.XMLParser(remove_blank_text=False, resolve_entities=False)
+
+
+def qn(tag):
+    prefix, local = tag.split(":")
+    return f"{{{NS[prefix]}}}{local}"
+
+
+def parse_xml(blob):
+    return etree.fromstring(blob, XML_PARSER)
+
+
+def serialize_xml(element):
+    return etree.tostring(element, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def rels_part_name(part_name):
+    directory, base = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", f"{base}.rels")
+
+
+def resolve_target(source_part_name, target):
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part_name), target))
+
+
+def relative_target(source_part_name, target_part_name):
+    return posixpath.relpath(target_part_name, posixpath.dirname(source_part_name) or ".")
+
+
+def parse_rels(source_part_name, blob):
+    """Return {rId: (reltype, target_part_name or external URL, is_external)}."""
+    rels = {}
+    if blob is None:
+        return rels
+    for rel in parse_xml(blob).iterfind(qn("pr:Relationship")):
+        external = rel.get("TargetMode") == "External"
+        target = rel.get("Target")
+        rels[rel.get("Id")] = (
+            rel.get("Type"),
+            target if external else resolve_target(source_part_name, target),
+            external
+        )
+    return rels
+
+
+def read_member(zf, name):
+    try:
+        return zf.read(name)
+    except KeyError:
+        return None
+
+
+def copy_member_raw(zin, zout, info):
+    """Append member `info` of `zin` to `zout` as its stored compressed bytes (no recompression).
+
+    Falls back to read/writestr for members it cannot copy verbatim (encrypted, zip64).
+    """
+    if info.flag_bits & 0x1 or max(info.file_size, info.compress_size) >= zipfile.ZIP64_LIMIT:
+        zout.writestr(info, zin.read(info))
+        return
+    zin.fp.seek(info.header_offset)
+    local_header = zin.fp.read(zipfile.sizeFileHeader)
+    name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+    zin.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+    raw = zin.fp.read(info.compress_size)
+
+    out_info = copy.copy(info)
+    # CRC và kích thước đã biết -> ghi thẳng vào local header, không cần data descriptor
+    out_info.flag_bits &= ~0x08
+    # Giống ZipFile.mkdir: ghi local header + dữ liệu rồi đăng ký vào central directory
+    with zout._lock:
+        if zout._seekable:
+            zout.fp.seek(zout.start_dir)
+        out_info.header_offset = zout.fp.tell()
+        zout._writecheck(out_info)
+        zout._didModify = True
+        zout.fp.write(out_info.FileHeader(False))
+        zout.fp.write(raw)
+        zout.filelist.append(out_info)
+        zout.NameToInfo[out_info.filename] = out_info
+        zout.start_dir = zout.fp.tell()
+
+
+def main_document_part_name(zf):
+    for reltype, target, _ in parse_rels("", read_member(zf, "_rels/.rels")).values():
+        if reltype == RT_OFFICE_DOCUMENT:
+            return target
+    raise ValueError("Package không có presentation part (officeDocument)")
+
+
+def slide_part_names(zf, presentation_part_name=None, presentation=None):
+    """Slide part names in presentation order (p:sldIdLst)."""
+    presentation_part_name = presentation_part_name or main_document_part_name(zf)
+    if presentation is None:
+        presentation = parse_xml(zf.read(presentation_part_name))
+    rels = parse_rels(presentation_part_name, read_member(
+        zf, rels_part_name(presentation_part_name)))
+    return [rels[sld_id.get(qn("r:id"))][1]
+            for sld_id in presentation.iterfind(f"{qn('p:sldIdLst')}/{qn('p:sldId')}")]
+
+
+def iter_shape_elements(slide_root):
+    sp_tree = slide_root.find(f"{qn('p:cSld')}/{qn('p:spTree')}")
+    if sp_tree is None:
+        return []
+    return [child for child in sp_tree if child.tag in SHAPE_TAGS]
+
+
+def serialize_rels(source_part_name, rels):
+    """Inverse of parse_rels: {rId: (reltype, target, is_external)} -> .rels XML bytes."""
+    root = etree.Element(qn("pr:Relationships"), nsmap={None: NS["pr"]})
+    for rId, (reltype, target, external) in rels.items():
+        rel = etree.SubElement(root, qn("pr:Relationship"))
+        rel.set("Id", rId)
+        rel.set("Type", reltype)
+        rel.set("Target", target if external else relative_target(source_part_name, target))
+        if external:
+            rel.set("TargetMode", "External")
+    return serialize_xml(root)
+
+
+class ContentTypes:
+    def __init__(self, blob):
+        self.root = parse_xml(blob)
+        self.defaults = {}
+        self.overrides = {}
+        for elm in self.root:
+            if elm.tag == qn("ct:Default"):
+                self.defaults[elm.get("Extension").lower()] = elm.get("ContentType")
+            elif elm.tag == qn("ct:Override"):
+                self.overrides[elm.get("PartName").lstrip("/")] = elm.get("ContentType")
+
+    def content_type(self, part_name):
+        override = self.overrides.get(part_name)
+        if override is not None:
+            return override
+        return self.defaults.get(posixpath.splitext(part_name)[1][1:].lower())
+
+    def add(self, part_name, content_type):
+        """Register `part_name`, using an Override only when the extension default does not fit."""
+        if content_type is None or self.content_type(part_name) == content_type:
+            return
+        ext = posixpath.splitext(part_name)[1][1:].lower()
+        if ext and ext not in self.defaults and ext != "xml":
+            self.defaults[ext] = content_type
+            elm = etree.Element(qn("ct:Default"))
+            elm.set("Extension", ext)
+            elm.set("ContentType", content_type)
+            self.root.insert(0, elm)
+            return
+        self.overrides[part_name] = content_type
+        elm = etree.SubElement(self.root, qn("ct:Override"))
+        elm.set("PartName", f"/{part_name}")
+        elm.set("ContentType", content_type)
+
+    def remove(self, part_name):
+        if self.overrides.pop(part_name, None) is None:
+            return
+        for elm in self.root.iterfind(qn("ct:Override")):
+            if elm.get("PartName").lstrip("/") == part_name:
+                self.root.remove(elm)
+
+    def to_xml(self):
+        return serialize_xml(self.root)
@@ -0,0 +1,153 @@
+# Đọc package pptx lazy: zip trên mmap, part và relationship chỉ được load khi cần
+import mmap
+import zipfile
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from pptx.opc.package import PartFactory
+from pptx.opc.package import _ContentTypeMap
+from pptx.opc.package import _Relationship
+from pptx.opc.packuri import CONTENT_TYPES_URI
+from pptx.opc.packuri import PACKAGE_URI
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.package import Package
+from pptx.slide import Slides
+from pptx.util import lazyproperty
+
+
+class ReadOnlyPackageError(TypeError):
+    """Raised when a write operation is attempted on a LazyPackage."""
+
+
+class _MmapFile:
+    """Read-only file object over an mmap (mmap.seekable() only exists from Python 3.13)."""
+
+    def __init__(self, mm):
+        self._mm = mm
+        self.read = mm.read
+        self.seek = mm.seek
+        self.tell = mm.tell
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self._mm.close()
+
+
+class _LazyRelationship(_Relationship):
+    """Relationship whose target part is loaded from the package on first access."""
+
+    def __init__(self, package, base_uri, rId, reltype, target_mode, target):
+        super().__init__(base_uri, rId, reltype, target_mode, target)
+        self._package = package
+
+    @property
+    def target_part(self):
+        if self.is_external:
+            raise ValueError(
+                "`.target_part` property on _Relationship is undefined when target-mode is external")
+        if not isinstance(self._target, PackURI):
+            return self._target
+        return self._package.part(self._target)
+
+    @property
+    def target_partname(self):
+        if self.is_external:
+            raise ValueError(
+                "`.target_partname` property on _Relationship is undefined when target-mode is external")
+        return self._target if isinstance(self._target, PackURI) else self._target.partname
+
+
+class LazyPackage(Package):
+    def __init__(self, pptx_path):
+        super().__init__(pptx_path)
+        self._file = open(pptx_path, "rb")
+        try:
+            self._mmap = _MmapFile(mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ))
+            self._zip = zipfile.ZipFile(self._mmap)
+        except Exception:
+            self._file.close()
+            raise
+        self._members = set(self._zip.namelist())
+        self._parts = {}
+        self._load_rels(self._rels, PACKAGE_URI)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+        self._mmap.close()
+        self._file.close()
+
+    @property
+    def presentation(self):
+        return self.main_document_part.presentation
+
+    @lazyproperty
+    def slides(self):
+        # Presentation.slides đổi tên (và vì thế load) mọi slide part; ở đây slide chỉ load khi được truy cập
+        presentation = self.presentation
+        return Slides(presentation._element.get_or_add_sldIdLst(), presentation)
+
+    @property
+    def loaded_partnames(self):
+        return list(self._parts)
+
+    @lazyproperty
+    def _content_types(self):
+        return _ContentTypeMap.from_xml(self._read(CONTENT_TYPES_URI))
+
+    def _read(self, partname):
+        return self._zip.read(partname.membername)
+
+    def _has_member(self, partname):
+        return partname.membername in self._members
+
+    def part(self, partname):
+        """Return the part for `partname`, loading it (and only it) on first access."""
+        part = self._parts.get(partname)
+        if part is None:
+            part = PartFactory(partname, self._content_types[partname], self, blob=self._read(partname))
+            self._parts[partname] = part
+            self._load_rels(part.rels, partname)
+        return part
+
+    def _load_rels(self, rels, partname):
+        rels_uri = partname.rels_uri
+        if not self._has_member(rels_uri):
+            return
+        base_uri = partname.baseURI
+        xml_rels = parse_xml(self._read(rels_uri))
+        rels._rels.clear()
+        for rel_elm in xml_rels.relationship_lst:
+            if rel_elm.targetMode == RTM.EXTERNAL:
+                target = rel_elm.target_ref
+            else:
+                target = PackURI.from_rel_ref(base_uri, rel_elm.target_ref)
+                # Bỏ qua relationship trỏ tới part không có trong package (giống python-pptx)
+                if not self._has_member(target):
+                    continue
+            rels._rels[rel_elm.rId] = _LazyRelationship(
+                self, base_uri, rel_elm.rId, rel_elm.reltype, rel_elm.targetMode, target)
+
+    def iter_parts(self):
+        # python-pptx duyệt toàn bộ part khi thêm ảnh/part mới (dedup ảnh, next_partname, ...)
+        raise ReadOnlyPackageError(
+            "LazyPackage chỉ đọc: không thể thêm ảnh/part hay duyệt toàn bộ part, "
+            "hãy mở bằng Presentation() để chỉnh sửa")
+
+    def save(self, pkg_file):
+        raise ReadOnlyPackageError("LazyPackage chỉ đọc: hãy mở bằng Presentation() để chỉnh sửa và lưu")
+
+
+def open_lazy_package(pptx_path):
+    """Open `pptx_path` for reading: parts are loaded on first access.
+
+    The returned package and its `presentation` are read-only. Anything that adds parts (pictures,
+    new slides) or saves raises ReadOnlyPackageError; use pptx.Presentation for editing.
+    """
+    return LazyPackage(pptx_path)
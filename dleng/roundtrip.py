@@ -0,0 +1,219 @@
+# Kiểm tra round-trip: dump(x) -> build -> dump lại, so sánh 2 cây DL_PPTXData bằng hash cấu trúc
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dacite import from_dict
+from data.pptxdata import DL_PPTXData
+from build import build_pptx_from_json
+from dump import extract_slide_data
+
+
+class _Node:
+    __slots__ = ("digest", "value", "children")
+
+    def __init__(self, digest, value, children):
+        self.digest = digest
+        self.value = value
+        self.children = children
+
+
+def hash_tree(obj, ignore=frozenset()):
+    """Hash every subtree of a JSON-like tree; equal digests mean equal subtrees."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, dict):
+        children = {key: hash_tree(value, ignore) for key, value in obj.items() if key not in ignore}
+        h.update(b"d")
+        for key, child in children.items():
+            h.update(key.encode("utf-8"))
+            h.update(child.digest)
+        return _Node(h.digest(), None, children)
+    if isinstance(obj, (list, tuple)):
+        children = [hash_tree(value, ignore) for value in obj]
+        h.update(b"l")
+        for child in children:
+            h.update(child.digest)
+        return _Node(h.digest(), None, children)
+    h.update(b"v")
+    h.update(json.dumps(obj).encode("utf-8"))
+    return _Node(h.digest(), obj, None)
+
+
+def first_difference(expected, actual, path=()):
+    """Path and values of the first differing leaf (depth-first), or None when identical."""
+    if expected.digest == actual.digest:
+        return None
+    if isinstance(expected.children, dict) and isinstance(actual.children, dict):
+        for key in list(expected.children) + [k for k in actual.children if k not in expected.children]:
+            if key not in expected.children or key not in actual.children:
+                return path + (key,), _leaf(expected.children.get(key)), _leaf(actual.children.get(key))
+            diff = first_difference(expected.children[key], actual.children[key], path + (key,))
+            if diff is not None:
+                return diff
+    elif isinstance(expected.children, list) and isinstance(actual.children, list):
+        for idx, (a, b) in enumerate(zip(expected.children, actual.children)):
+            diff = first_difference(a, b, path + (idx,))
+            if diff is not None:
+                return diff
+        return path, f"<{len(expected.children)} phần tử>", f"<{len(actual.children)} phần tử>"
+    return path, _leaf(expected), _leaf(actual)
+
+
+def _leaf(node):
+    if node is None:
+        return None
+    if node.children is None:
+        return node.value
+    return f"<{type(node.children).__name__}>"
+
+
+def describe_path(path):
+    """Turn a tree path into slide/shape/cell/paragraph/run coordinates (1-based, like the dump)."""
+    location = {}
+    names = {"slides": "slide", "shapes": "shape", "paragraphs": "paragraph", "runs": "run"}
+    idx = 0
+    while idx < len(path):
+        key = path[idx]
+        if key in names and idx + 1 < len(path) and isinstance(path[idx + 1], int):
+            location[names[key]] = path[idx + 1] + 1
+            idx += 2
+            continue
+        if key in ("data", "data_detail", "cell_fills", "cell_borders") and idx + 2 < len(path) \
+                and isinstance(path[idx + 1], int) and isinstance(path[idx + 2], int):
+            location["cell"] = (path[idx + 1] + 1, path[idx + 2] + 1)
+            location["field"] = key
+            idx += 3
+            continue
+        if not isinstance(key, int):
+            location["field"] = key
+        idx += 1
+    location["path"] = "/".join(str(p) for p in path)
+    return location
+
+
+def normalize(data):
+    """Keep only what DL_PPTXData models (drops debug raw_attributes etc.)."""
+    return dataclasses.asdict(from_dict(data_class=DL_PPTXData, data=data))
+
+
+def check_roundtrip(pptx_path, work_dir=None, ignore=frozenset(), keep_files=False):
+    result = {"deck": pptx_path, "ok": False, "difference": None, "error": None}
+    tmp_dir = None
+    stage = "setup"
+    try:
+        tmp_dir = work_dir or tempfile.mkdtemp(prefix="dleng_roundtrip_")
+        first_dir = os.path.join(tmp_dir, "original")
+        second_dir = os.path.join(tmp_dir, "rebuilt")
+        os.makedirs(first_dir, exist_ok=True)
+        os.makedirs(second_dir, exist_ok=True)
+
+        stage = "dump"
+        original = extract_slide_data(pptx_path, first_dir)
+        json_path = os.path.join(first_dir, "original.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(original, f, ensure_ascii=False)
+
+        stage = "build"
+        rebuilt_path = os.path.join(second_dir, "rebuilt.pptx")
+        build_pptx_from_json(json_path, rebuilt_path)
+
+        stage = "re-dump"
+        rebuilt = extract_slide_data(rebuilt_path, second_dir)
+
+        stage = "compare"
+        expected = hash_tree(normalize(json.loads(json.dumps(original))), ignore)
+        actual = hash_tree(normalize(json.loads(json.dumps(rebuilt))), ignore)
+        diff = first_difference(expected, actual)
+        if diff is None:
+            result["ok"] = True
+        else:
+            path, expected_value, actual_value = diff
+            result["difference"] = {**describe_path(path),
+                                    "expected": expected_value, "actual": actual_value}
+    except Exception as e:
+        result["error"] = f"{stage}: {type(e).__name__}: {e}"
+    finally:
+        if work_dir is None and tmp_dir is not None and not keep_files:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return result
+
+
+def _check_one(args):
+    pptx_path, ignore = args
+    return check_roundtrip(pptx_path, ignore=ignore)
+
+
+def _worker_error(pptx_path, error):
+    return {"deck": pptx_path, "ok": False, "difference": None,
+            "error": f"worker: {type(error).__name__}: {error}"}
+
+
+def _run_pool(func, items, max_workers):
+    """Run `func` over `items` in one pool: ({item: result or exception}, items left unfinished
+    because a worker process died)."""
+    results = {}
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(item, pool.submit(func, item)) for item in items]
+        for item, future in futures:
+            try:
+                results[item] = future.result()
+            except BrokenProcessPool:
+                unfinished.append(item)
+            except Exception as e:
+                results[item] = e
+    return results, unfinished
+
+
+def map_isolated(func, items, max_workers=None):
+    """Like pool.map, but a worker that dies (segfault, OOM kill, os._exit) only fails its own item.
+
+    A dead worker marks every pending future of the pool as BrokenProcessPool, so the unfinished
+    items are resubmitted to a fresh pool; when a batch makes no progress it is bisected until the
+    item that kills its worker runs alone. Returns {item: result or exception}.
+    """
+    results = {}
+    batches = [list(items)]
+    while batches:
+        batch = batches.pop()
+        done, unfinished = _run_pool(func, batch, max_workers)
+        results.update(done)
+        if not unfinished:
+            continue
+        if len(unfinished) == 1:
+            # chỉ còn một item chưa xong -> chính nó làm chết worker
+            results[unfinished[0]] = BrokenProcessPool("worker process died while running this item")
+        elif len(unfinished) < len(batch):
+            batches.append(unfinished)
+        else:
+            middle = len(unfinished) // 2
+            batches.append(unfinished[middle:])
+            batches.append(unfinished[:middle])
+    return results
+
+
+def check_corpus(folder, pattern="**/*.pptx", max_workers=None, ignore=frozenset(), report_path=None):
+    """Run check_roundtrip over every deck of `folder` in a process pool."""
+    decks = sorted(glob.glob(os.path.join(folder, pattern), recursive=True))
+    ignore = frozenset(ignore)
+    jobs = [(deck, ignore) for deck in decks]
+    outcomes = map_isolated(_check_one, jobs, max_workers=max_workers)
+    results = []
+    for job in jobs:
+        outcome = outcomes[job]
+        results.append(_worker_error(job[0], outcome) if isinstance(outcome, BaseException) else outcome)
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return results
+
+
+if __name__ == "__main__":
+    for item in check_corpus("template"):
+        status = "OK" if item["ok"] else (item["error"] or item["difference"])
+        print(f"{item['deck']}: {status}")
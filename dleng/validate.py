@@ -0,0 +1,236 @@
+# Kiểm tra nhanh JSON dump (DL_PPTXData) trước khi build, báo toàn bộ lỗi một lần
+import dataclasses
+import re
+import typing
+from typing import Any, List, Union
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.text import PP_ALIGN
+from data.pptxdata import *
+
+# Khớp parse_color: bỏ khoảng trắng sau "RGB:" rồi đọc 6 ký tự hex đầu tiên
+RGB_COLOR_RE = re.compile(r"RGB:\s*[0-9A-Fa-f]{6}")
+THEME_COLOR_NAMES = frozenset(member.name for member in MSO_THEME_COLOR)
+ALIGNMENT_VALUES = frozenset(int(member) for member in PP_ALIGN)
+
+# Các field chứa chuỗi màu theo định dạng của parse_color (build.py)
+COLOR_FIELDS = {
+    DL_Shape: ("background_fill_color",),
+    DL_Border: ("color",),
+    DL_BorderStyle: ("color",),
+    DL_Run: ("font_color",),
+}
+
+_COMPILED = {}
+
+
+class PPTXDataValidationError(ValueError):
+    category = "invalid_input"
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(
+            f"JSON dump không hợp lệ ({len(errors)} lỗi):\n" + "\n".join(errors))
+
+
+def check_color(value, path, errors):
+    if value is None or value == "None":
+        return
+    if value.startswith("RGB:"):
+        if not RGB_COLOR_RE.match(value):
+            errors.append(f"{path}: màu RGB không hợp lệ {value!r}")
+    elif value.startswith("Theme:"):
+        if value[6:].strip() not in THEME_COLOR_NAMES:
+            errors.append(f"{path}: màu theme không hợp lệ {value!r}")
+    else:
+        errors.append(f"{path}: định dạng màu không hỗ trợ {value!r} (cần 'RGB:RRGGBB' hoặc 'Theme:<tên>')")
+
+
+def _type_name(tp):
+    return getattr(tp, "__name__", None) or str(tp).replace("typing.", "")
+
+
+def compile_validator(tp):
+    """Build (once per type) a function check(value, path, errors) for a type annotation."""
+    checker = _COMPILED.get(tp)
+    if checker is not None:
+        return checker
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+
+    if tp is Any:
+        def checker(value, path, errors):
+            pass
+    elif dataclasses.is_dataclass(tp):
+        # Đăng ký trước để hỗ trợ kiểu đệ quy
+        fields = []
+
+        def checker(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: cần object {tp.__name__}, nhận {type(value).__name__}")
+                return
+            for name, required, check in fields:
+                if name in value:
+                    check(value[name], f"{path}.{name}", errors)
+                elif required:
+                    errors.append(f"{path}: thiếu field bắt buộc '{name}'")
+            semantic = SEMANTIC_CHECKS.get(tp)
+            if semantic is not None:
+                semantic(value, path, errors)
+
+        _COMPILED[tp] = checker
+        hints = typing.get_type_hints(tp)
+        for field in dataclasses.fields(tp):
+            hint = hints[field.name]
+            # dacite điền None cho field Optional bị thiếu
+            required = (field.default is dataclasses.MISSING
+                        and field.default_factory is dataclasses.MISSING
+                        and type(None) not in typing.get_args(hint))
+            fields.append((field.name, required, compile_validator(hint)))
+        color_fields = COLOR_FIELDS.get(tp, ())
+        if color_fields:
+            structural = checker
+
+            def checker(value, path, errors):
+                structural(value, path, errors)
+                if isinstance(value, dict):
+                    for name in color_fields:
+                        color = value.get(name)
+                        if isinstance(color, str):
+                            check_color(color, f"{path}.{name}", errors)
+    elif origin is Union:
+        optional = type(None) in args
+        members = [arg for arg in args if arg is not type(None)]
+        member_checkers = [compile_validator(arg) for arg in members]
+        expected = " | ".join(_type_name(arg) for arg in members)
+
+        def checker(value, path, errors):
+            if value is None:
+                if not optional:
+                    errors.append(f"{path}: không được null")
+                return
+            for member_check in member_checkers:
+                member_errors = []
+                member_check(value, path, member_errors)
+                if not member_errors:
+                    return
+            if len(member_checkers) == 1:
+                errors.extend(member_errors)
+            else:
+                errors.append(f"{path}: cần {expected}, nhận {type(value).__name__}")
+    elif origin is list:
+        item_check = compile_validator(args[0]) if args else compile_validator(Any)
+
+        def checker(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: cần list, nhận {type(value).__name__}")
+                return
+            for idx, item in enumerate(value):
+                item_check(item, f"{path}[{idx}]", errors)
+    elif origin is dict:
+        value_check = compile_validator(args[1]) if args else compile_validator(Any)
+
+        def checker(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: cần object, nhận {type(value).__name__}")
+                return
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    errors.append(f"{path}: key {key!r} phải là chuỗi")
+                value_check(item, f"{path}.{key}", errors)
+    elif tp is float:
+        def checker(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{path}: cần số, nhận {type(value).__name__}")
+    elif tp in (int, str, bool):
+        def checker(value, path, errors):
+            if not isinstance(value, tp) or (tp is int and isinstance(value, bool)):
+                errors.append(f"{path}: cần {tp.__name__}, nhận {type(value).__name__}")
+    else:
+        raise TypeError(f"Không hỗ trợ kiểu {tp!r} trong validator")
+
+    _COMPILED[tp] = checker
+    return checker
+
+
+def _check_grid(value, name, rows, cols, path, errors):
+    grid = value.get(name)
+    if not isinstance(grid, list) or (not grid and name != "data"):
+        return
+    if len(grid) != rows:
+        errors.append(f"{path}.{name}: có {len(grid)} hàng, cần {rows}")
+    for r_idx, row in enumerate(grid):
+        if isinstance(row, list) and len(row) != cols:
+            errors.append(f"{path}.{name}[{r_idx}]: có {len(row)} cột, cần {cols}")
+
+
+def check_table(value, path, errors):
+    rows, cols = value.get("rows"), value.get("cols")
+    if not isinstance(rows, int) or not isinstance(cols, int):
+        return
+    if rows < 1 or cols < 1:
+        errors.append(f"{path}: kích thước bảng không hợp lệ ({rows}x{cols})")
+        return
+    for name in ("data", "data_detail", "cell_fills", "cell_borders"):
+        _check_grid(value, name, rows, cols, path, errors)
+
+    cell_fills = value.get("cell_fills")
+    if isinstance(cell_fills, list):
+        for r_idx, row in enumerate(cell_fills):
+            for c_idx, color in enumerate(row if isinstance(row, list) else []):
+                if isinstance(color, str):
+                    check_color(color, f"{path}.cell_fills[{r_idx}][{c_idx}]", errors)
+
+    # col_widths / row_heights thiếu hoặc thừa phần tử: rebuild_table chỉ áp dụng phần chung
+
+    # Ô đã thuộc một vùng merge (>1 ô) -> python-pptx từ chối merge vùng khác chứa ô đó
+    merged_cells = {}
+    merge_info = value.get("merge_info")
+    for idx, merge in enumerate(merge_info if isinstance(merge_info, list) else []):
+        if not isinstance(merge, dict):
+            continue
+        r, c = merge.get("row"), merge.get("col")
+        row_span, col_span = merge.get("row_span"), merge.get("col_span")
+        if not all(isinstance(v, int) for v in (r, c, row_span, col_span)):
+            continue
+        if row_span < 1 or col_span < 1:
+            errors.append(f"{path}.merge_info[{idx}]: span phải >= 1")
+        elif r < 0 or c < 0 or r + row_span > rows or c + col_span > cols:
+            errors.append(
+                f"{path}.merge_info[{idx}]: vùng merge ({r},{c}) span {row_span}x{col_span} vượt ngoài bảng {rows}x{cols}")
+        else:
+            cells = [(i, j) for i in range(r, r + row_span) for j in range(c, c + col_span)]
+            overlap = next((cell for cell in cells if cell in merged_cells), None)
+            if overlap is not None:
+                errors.append(
+                    f"{path}.merge_info[{idx}]: vùng merge ({r},{c}) span {row_span}x{col_span} chồng lên "
+                    f"merge_info[{merged_cells[overlap]}] tại ô {overlap}")
+            elif len(cells) > 1:
+                merged_cells.update((cell, idx) for cell in cells)
+
+
+def check_paragraph(value, path, errors):
+    alignment = value.get("alignment")
+    if isinstance(alignment, int) and alignment and alignment not in ALIGNMENT_VALUES:
+        errors.append(f"{path}.alignment: giá trị căn lề không hợp lệ {alignment}")
+
+
+SEMANTIC_CHECKS = {
+    DL_Table: check_table,
+    DL_TextParagraph: check_paragraph,
+}
+
+_validate_pptx_data = compile_validator(DL_PPTXData)
+
+
+def validate_pptx_data(data) -> List[str]:
+    """Return every error found in a dump dict; empty list when it can be built."""
+    errors = []
+    _validate_pptx_data(data, "$", errors)
+    return errors
+
+
+def ensure_valid_pptx_data(data):
+    errors = validate_pptx_data(data)
+    if errors:
+        raise PPTXDataValidationError(errors)
@@ -0,0 +1,79 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dleng"))
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+from deckops import merge_decks
+from deckops import split_deck
+
+RT_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, format="PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def _make_deck(path):
+    """3 slides: slide 1 jumps to slide 3, slide 3 has a picture."""
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    slides = [prs.slides.add_slide(layout) for _ in range(3)]
+    link = slides[0].shapes.add_textbox(0, 0, Inches(2), Inches(1))
+    link.text_frame.text = "go to 3"
+    link.click_action.target_slide = slides[2]
+    slides[2].shapes.add_picture(_png(), 0, 0, Inches(1), Inches(1))
+    prs.save(path)
+    return path
+
+
+class DeckOpsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.deck = _make_deck(os.path.join(self.tmp_dir.name, "deck.pptx"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_split_drops_linked_slides(self):
+        [path] = split_deck(self.deck, os.path.join(self.tmp_dir.name, "split"), [1])
+        with zipfile.ZipFile(path) as zf:
+            names = zf.namelist()
+            slide_rels = zf.read("ppt/slides/_rels/slide1.xml.rels").decode()
+            slide_xml = zf.read("ppt/slides/slide1.xml").decode()
+        self.assertNotIn("ppt/slides/slide3.xml", names)
+        self.assertFalse([name for name in names if name.startswith("ppt/media/")])
+        self.assertNotIn(RT_SLIDE + '"', slide_rels)
+        self.assertNotIn("hlinkClick", slide_xml)
+        prs = Presentation(path)
+        self.assertEqual(len(prs.slides), 1)
+        self.assertEqual(prs.slides[0].shapes[0].text_frame.text, "go to 3")
+
+    def test_split_keeps_media_of_kept_slide(self):
+        [path] = split_deck(self.deck, os.path.join(self.tmp_dir.name, "split"), [3])
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(len([n for n in zf.namelist() if n.startswith("ppt/media/")]), 1)
+        self.assertEqual(len(Presentation(path).slides), 1)
+
+    def test_merge_remaps_links_and_dedups_media(self):
+        output = merge_decks([self.deck, self.deck], os.path.join(self.tmp_dir.name, "merged.pptx"))
+        with zipfile.ZipFile(output) as zf:
+            self.assertEqual(len([n for n in zf.namelist() if n.startswith("ppt/media/")]), 1)
+        prs = Presentation(output)
+        self.assertEqual(len(prs.slides), 6)
+        # nút "jump" của bản sao trỏ tới slide 3 của bản sao, không phải của deck gốc
+        target = prs.slides[3].shapes[0].click_action.target_slide
+        self.assertEqual(prs.slides.index(target), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
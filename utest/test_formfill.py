@@ -0,0 +1,79 @@
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "dleng"))
+
+from lxml import etree
+from pptx import Presentation
+from formfill import fill_form
+from formfill import replace_tokens
+from opc import NS
+
+TEMPLATE = os.path.join(HERE, "..", "template", "Pre_DOI_Form_05_2024_v2.pptx")
+
+
+def _raw_members(path):
+    """{name: compressed bytes} straight from the zip file."""
+    members = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            f.seek(info.header_offset)
+            header = f.read(zipfile.sizeFileHeader)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+            members[info.filename] = f.read(info.compress_size)
+    return members
+
+
+def _paragraph(*runs):
+    """<a:p> with one run per (text, bold)."""
+    body = "".join(f'<a:r><a:rPr b="{int(bold)}"/><a:t>{text}</a:t></a:r>' for text, bold in runs)
+    return etree.fromstring(f'<a:p xmlns:a="{NS["a"]}">{body}</a:p>')
+
+
+def _runs(paragraph):
+    a = f"{{{NS['a']}}}"
+    return [(r.find(f"{a}t").text or "", r.find(f"{a}rPr").get("b") == "1") for r in paragraph]
+
+
+class FillFormTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_untouched_members_are_copied_byte_for_byte(self):
+        output = os.path.join(self.tmp_dir.name, "out.pptx")
+        fill_form(TEMPLATE, output, {(1, 1): "xyz"})
+        before, after = _raw_members(TEMPLATE), _raw_members(output)
+        self.assertEqual(list(before), list(after))
+        changed = [name for name in before if before[name] != after[name]]
+        self.assertEqual(changed, ["ppt/slides/slide1.xml"])
+        self.assertEqual(Presentation(output).slides[0].shapes[0].text_frame.text, "xyz")
+
+    def test_output_can_be_the_template(self):
+        path = os.path.join(self.tmp_dir.name, "template.pptx")
+        shutil.copyfile(TEMPLATE, path)
+        fill_form(path, path, {(1, 1): "xyz"})
+        self.assertEqual(Presentation(path).slides[0].shapes[0].text_frame.text, "xyz")
+
+    def test_token_across_runs_keeps_other_runs(self):
+        paragraph = _paragraph(("Tên: ", True), ("{{na", False), ("me}} - ", False), ("hết", True))
+        self.assertEqual(replace_tokens(paragraph, {"{{name}}": "A"}), 1)
+        self.assertEqual(_runs(paragraph), [("Tên: ", True), ("A", False), (" - ", False), ("hết", True)])
+
+    def test_replacement_values_are_not_rescanned(self):
+        paragraph = _paragraph(("{{a}} {{b}}", False))
+        replace_tokens(paragraph, {"{{a}}": "{{b}}", "{{b}}": "B"})
+        self.assertEqual(_runs(paragraph), [("{{b}} B", False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dleng"))
+
+from index import DeckIndex
+
+
+def _deck(*paragraphs):
+    return {"slides": [{"slide_number": 1, "shapes": [
+        {"shape_index": 1, "text": {"paragraphs": list(paragraphs)}}]}]}
+
+
+class DeckIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = DeckIndex(os.path.join(self.tmp_dir.name, "index.db"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def test_failed_add_does_not_leak_term_ids(self):
+        # Paragraph thứ 2 thiếu paragraph_index -> add_deck lỗi sau khi đã insert term "alpha"
+        broken = _deck({"paragraph_index": 1, "text": "alpha"}, {"text": "beta"})
+        with self.assertRaises(KeyError):
+            self.index.add_deck("broken", broken)
+
+        self.index.add_deck("d0", _deck({"paragraph_index": 1, "text": "alpha"}))
+        self.index.add_deck("d1", _deck({"paragraph_index": 1, "text": "gamma"}))
+        self.assertEqual(self.index.decks(), ["d0", "d1"])
+        self.assertEqual([hit["deck"] for hit in self.index.search("alpha")], ["d0"])
+        self.assertEqual([hit["deck"] for hit in self.index.search("gamma")], ["d1"])
+
+    def test_for_txt_line_breaks_are_unescaped(self):
+        self.index.add_deck("d1", _deck({"paragraph_index": 1, "text": "data1\\ndata2"}), for_txt=True)
+        self.assertEqual(len(self.index.search("data2")), 1)
+        self.assertEqual(self.index.search("ndata2"), [])
+
+    def test_backslash_n_is_text_in_regular_dumps(self):
+        self.index.add_deck("d1", _deck({"paragraph_index": 1, "text": "C:\\new"}))
+        self.assertEqual(len(self.index.search("new")), 1)
+        self.assertEqual(self.index.search("ew"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
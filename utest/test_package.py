@@ -0,0 +1,35 @@
+import io
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "dleng"))
+
+from PIL import Image
+from package import ReadOnlyPackageError
+from package import open_lazy_package
+
+DECK = os.path.join(HERE, "test_ppt1.pptx")
+
+
+class LazyPackageTest(unittest.TestCase):
+    def test_reads_slides_without_loading_everything(self):
+        with open_lazy_package(DECK) as package:
+            slides = package.slides
+            self.assertGreater(len(slides), 0)
+            self.assertGreater(len(list(slides[0].shapes)), 0)
+
+    def test_adding_parts_raises_read_only_error(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+        with open_lazy_package(DECK) as package:
+            slide = package.slides[0]
+            with self.assertRaises(ReadOnlyPackageError):
+                slide.shapes.add_picture(buffer, 0, 0)
+            with self.assertRaises(ReadOnlyPackageError):
+                package.save(io.BytesIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
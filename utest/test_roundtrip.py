@@ -0,0 +1,26 @@
+import os
+import sys
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dleng"))
+
+from roundtrip import map_isolated
+
+
+def _square_or_die(item):
+    if item == 1:
+        os._exit(1)
+    return item * item
+
+
+class MapIsolatedTest(unittest.TestCase):
+    def test_dead_worker_only_fails_its_own_item(self):
+        results = map_isolated(_square_or_die, range(8), max_workers=2)
+        self.assertIsInstance(results[1], BrokenProcessPool)
+        self.assertEqual({item: value for item, value in results.items() if item != 1},
+                         {item: item * item for item in range(8) if item != 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "dleng"))
+
+from validate import validate_pptx_data
+
+
+def _load_predoi():
+    with open(os.path.join(HERE, "predoi_v3.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _first_table(data):
+    return next(shape["table"] for slide in data["slides"] for shape in slide["shapes"] if shape.get("table"))
+
+
+class ValidatePPTXDataTest(unittest.TestCase):
+    def test_fixture_is_valid(self):
+        self.assertEqual(validate_pptx_data(_load_predoi()), [])
+
+    def test_overlapping_merges_are_reported(self):
+        data = _load_predoi()
+        _first_table(data)["merge_info"].append({"row": 0, "col": 1, "row_span": 2, "col_span": 1})
+        errors = validate_pptx_data(data)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("chồng lên merge_info[0]", errors[0])
+
+    def test_accepts_what_the_builder_accepts(self):
+        data = _load_predoi()
+        table = _first_table(data)
+        table["col_widths"] = table["col_widths"][:2]
+        table["row_heights"] = table["row_heights"] + [100]
+        table["cell_fills"][0][0] = "RGB: FF0000"
+        self.assertEqual(validate_pptx_data(data), [])
+
+
+if __name__ == "__main__":
+    unittest.main()